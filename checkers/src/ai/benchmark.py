@@ -0,0 +1,122 @@
+import argparse
+import time
+from .engine import SearchLimits, create_engine
+from ..game.pieces import *
+
+# Fixed positions for comparing engines: the start and quiet positions with a
+# choice of moves from random games, drawn row 0 (black's back row) first with
+# '.' for an empty square
+BENCHMARK_POSITIONS = (
+    ("start", RED_PIECE, (
+        ".b.b.b.b",
+        "b.b.b.b.",
+        ".b.b.b.b",
+        "........",
+        "........",
+        "r.r.r.r.",
+        ".r.r.r.r",
+        "r.r.r.r.")),
+    ("opening", BLACK_PIECE, (
+        ".b.b.b.b",
+        "b.b.b.b.",
+        ".....b..",
+        "..r...b.",
+        "........",
+        "......r.",
+        ".r.r.r.r",
+        "r.r.r.r.")),
+    ("early", BLACK_PIECE, (
+        ".b.b.b.b",
+        "b.b...b.",
+        "...b.b.b",
+        "b.......",
+        ".r...r.r",
+        "r.r.r...",
+        "...r...r",
+        "..r.r.r.")),
+    ("middle", BLACK_PIECE, (
+        ".b...b.b",
+        "..b.b...",
+        "...b.b.b",
+        "r.b...b.",
+        "........",
+        "r...r.r.",
+        ".r.r...r",
+        "r...r.r.")),
+    ("crowded", RED_PIECE, (
+        ".b.....b",
+        "b.....b.",
+        "...b.b.b",
+        "........",
+        ".r.b...r",
+        "......r.",
+        ".r......",
+        "..r.r.r.")),
+    ("black king", BLACK_PIECE, (
+        ".b.b....",
+        "..b.b...",
+        ".b...b..",
+        "r.....b.",
+        ".....r.r",
+        "r...r...",
+        ".B...r..",
+        "....r...")),
+    ("late", RED_PIECE, (
+        ".....b..",
+        "b.......",
+        ".....b..",
+        "b.......",
+        "........",
+        "..b.....",
+        ".....r..",
+        "r...r...")),
+    ("red king", BLACK_PIECE, (
+        ".R.....b",
+        "........",
+        ".r.....b",
+        "..b...b.",
+        "........",
+        "..r...r.",
+        ".......r",
+        "........")),
+)
+
+def parse_diagram(rows):
+    """Returns a board from eight strings of pieces, '.' for an empty square."""
+    return [[EMPTY if square == '.' else square for square in row] for row in rows]
+
+def run_benchmark(engine_names=("alphabeta", "mtdf"), depth=7, **options):
+    """
+    Searches every benchmark position to a fixed depth with each engine, each with
+    fresh tables. Options are passed to create_engine.
+    Returns {engine name: {"nodes": total, "time": seconds, "results": [SearchResult, ...]}}
+    """
+    report = {}
+    for name in engine_names:
+        results = []
+        start = time.perf_counter()
+        for _, player, rows in BENCHMARK_POSITIONS:
+            engine = create_engine(name, **options)
+            results.append(engine.search(parse_diagram(rows), player, SearchLimits(depth=depth)))
+        report[name] = {
+            "nodes": sum(result.nodes for result in results),
+            "time": time.perf_counter() - start,
+            "results": results,
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare engines on the benchmark positions")
+    parser.add_argument("engines", nargs="*", default=["alphabeta", "mtdf"])
+    parser.add_argument("--depth", type=int, default=7)
+    parser.add_argument("--lmr", action="store_true", help="enable late move reductions")
+    args = parser.parse_args()
+    options = {} if args.lmr else {"lmr_moves": None}
+    report = run_benchmark(args.engines, args.depth, **options)
+    for name, totals in report.items():
+        print(f"{name:12} {totals['nodes']:10} nodes {totals['time']:8.2f}s")
+        for (label, _, _), result in zip(BENCHMARK_POSITIONS, totals["results"]):
+            print(f"    {label:10} {result.move} score {result.score}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import argparse
+import logging
+import mmap
+import os
+import random
+import struct
+from .minimax import SearchContext, alphabeta
+from .transposition import TranspositionTable
+from ..game.bitboard import BitBoard, get_all_moves
+from ..game.board import initialize_board
+from ..game.move import encode_move, move_ends, MOVE_MASK
+from ..game.pieces import RED_PIECE, BLACK_PIECE
+from ..game.zobrist import board_key
+
+# File layout: MAGIC, then RECORD structs sorted by key. Each record is one
+# book move for a position; a position's moves are adjacent.
+MAGIC = b"CKBOOK02"
+RECORD = struct.Struct("<QHH")  # Position key, 16-bit packed move, weight
+MAX_WEIGHT = 100
+
+class OpeningBook:
+    """
+    Read-only opening book mapped into memory. Probes binary-search the file in
+    place, so processes that open the same book share its pages.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not an opening book")
+        self.size = (len(self._map) - len(MAGIC)) // RECORD.size
+
+    @classmethod
+    def open_if_exists(cls, path):
+        """Returns the book at path, or None when there is no usable file."""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Opening book {path} not loaded: {e}")
+            return None
+
+    def _key_at(self, index):
+        return RECORD.unpack_from(self._map, len(MAGIC) + index * RECORD.size)[0]
+
+    def probe(self, key):
+        """Returns [(move, weight), ...] stored for key, empty when it is not in the book."""
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        moves = []
+        offset = len(MAGIC) + low * RECORD.size
+        while low < self.size:
+            record_key, code, weight = RECORD.unpack_from(self._map, offset)
+            if record_key != key:
+                break
+            moves.append((move_ends(code), weight))
+            low += 1
+            offset += RECORD.size
+        return moves
+
+    def choose(self, board, player, rng=random):
+        """Returns a legal book move for board picked by weight, or None when out of book."""
+        key = board.key if isinstance(board, BitBoard) else board_key(board, player)
+        entries = self.probe(key)
+        if not entries:
+            return None
+        legal = get_all_moves(board if isinstance(board, BitBoard) else BitBoard.from_board(board, player), player)
+        # The book stores (start, end); answer with the generated Move that carries the path,
+        # skipping ends that several multi-jumps share
+        by_ends = {}
+        for move in legal:
+            by_ends[move] = None if move in by_ends else move
+        entries = [(by_ends[move], weight) for move, weight in entries if by_ends.get(move) is not None]
+        if not entries:
+            return None
+        moves, weights = zip(*entries)
+        return rng.choices(moves, weights)[0]
+
+    def close(self):
+        self._map.close()
+
+def write_book(path, book):
+    """Writes {key: [(move, weight), ...]} as a sorted book file."""
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        for key in sorted(book):
+            for move, weight in sorted(book[key], key=lambda entry: -entry[1]):
+                f.write(RECORD.pack(key, encode_move(move) & MOVE_MASK, weight))
+
+def score_moves(position, player, depth, context):
+    """
+    Searches every move for player to depth plies. The search scores from
+    player's point of view, so higher scores are better for player on either side.
+    """
+    scores = []
+    for move in get_all_moves(position, player):
+        undo = position.make_move(move)
+        score, _ = alphabeta(position, depth - 1, False, float('-inf'), float('inf'), player, context, 1)
+        position.unmake_move(undo)
+        scores.append((move, score))
+    return scores
+
+def book_moves(position, player, depth, margin, context):
+    """
+    Keeps the moves scoring within margin of the best, weighted from MAX_WEIGHT
+    for the best down to 1 at the edge of the margin.
+    """
+    scores = score_moves(position, player, depth, context)
+    if not scores:
+        return []
+    best = max(score for _, score in scores)
+    return [(move, max(1, round(MAX_WEIGHT * (1 - (best - score) / margin))) if margin > 0 else MAX_WEIGHT)
+            for move, score in scores if best - score <= margin]
+
+def build_book(path, games=64, plies=10, depth=7, margin=0.25, seed=None, tt_mb=16):
+    """
+    Plays games of self-play from the start position, choosing each of the
+    first plies moves by weight among the moves a depth-ply search rates within
+    margin of the best, and writes every position visited with its moves.
+    Returns the number of positions in the book.
+    """
+    rng = random.Random(seed)
+    context = SearchContext(TranspositionTable(tt_mb), quiescence=True)
+    book = {}
+    start = BitBoard.from_board(initialize_board(), RED_PIECE)
+    for game in range(games):
+        position = start.copy()
+        player = RED_PIECE
+        for _ in range(plies):
+            entries = book.get(position.key)
+            if entries is None:
+                entries = book_moves(position, player, depth, margin, context)
+                book[position.key] = entries
+            if not entries:
+                break
+            moves, weights = zip(*entries)
+            position.make_move(rng.choices(moves, weights)[0])
+            player = BLACK_PIECE if player == RED_PIECE else RED_PIECE
+        logging.info(f"Book game {game + 1}/{games}: {len(book)} positions")
+    write_book(path, {key: entries for key, entries in book.items() if entries})
+    return len(book)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an opening book by self-play from the start position")
+    parser.add_argument("path")
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--plies", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=7)
+    parser.add_argument("--margin", type=float, default=0.25)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    positions = build_book(args.path, args.games, args.plies, args.depth, args.margin, args.seed)
+    print(f"Wrote {positions} positions to {args.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Protocol
+from .book import OpeningBook
+from .eval_cache import EvalCache
+from .iterative import SearchHandle, iterative_deepening
+from .mcts import MCTS, EXPLORATION, BATCH_SIZE, ROLLOUT_DEPTH
+from .minimax import LMR_MOVES
+from .parallel import get_shared_table
+from .stats import SearchStats
+from .tablebase import Tablebase
+from .transposition import TranspositionTable
+from ..game.bitboard import BitBoard
+from ..game.move import Move
+from ..game.move_generator import get_all_moves
+from ..game.pieces import RED_PIECE, BLACK_PIECE
+
+
+@dataclass
+class SearchLimits:
+    """What an engine may spend on one search; None means no limit."""
+    time: Optional[float] = None  # Seconds
+    depth: Optional[int] = None
+    nodes: Optional[int] = None  # Playouts for MCTS; the alpha-beta engines limit by time and depth
+
+@dataclass
+class SearchResult:
+    move: Optional[Move]
+    score: Optional[float]  # Evaluation for the side to move; for MCTS, its win probability
+    pv: List[Move] = field(default_factory=list)
+    depth: int = 0
+    nodes: int = 0  # Including quiescence nodes
+    time: float = 0.0  # Seconds
+    stats: Optional[SearchStats] = None
+
+class Engine(Protocol):
+    """A move searcher. Implementations are registered with register_engine."""
+    name: str
+
+    def search(self, board, player, limits: SearchLimits) -> SearchResult:
+        """Searches board with player to move and returns the best move found."""
+        ...
+
+    def stop(self) -> None:
+        """Stops a search running on another thread; it returns its best move so far."""
+        ...
+
+    def new_game(self) -> None:
+        """Drops state that should not carry over into an unrelated game."""
+        ...
+
+_engines = {}
+
+def register_engine(name):
+    """Class decorator that makes an engine available to create_engine under name."""
+    def register(cls):
+        cls.name = name
+        _engines[name] = cls
+        return cls
+    return register
+
+def available_engines():
+    """Returns the names of the registered engines."""
+    return sorted(_engines)
+
+def create_engine(name, **options):
+    """Returns a new instance of the engine registered as name."""
+    if name not in _engines:
+        raise ValueError(f"Unknown engine {name!r}; available: {', '.join(available_engines())}")
+    return _engines[name](**options)
+
+def principal_variation(board, player, tt, max_length):
+    """
+    Follows the best moves stored in tt from the root, as played by alternating sides.
+    Stops where a stored (start, end) matches more than one generated move.
+    """
+    position = BitBoard.from_board(board, player)
+    pv = []
+    current = player
+    while len(pv) < max_length:
+        entry = tt.probe(position.key)
+        if entry is None:
+            break
+        # Tables that pack moves return plain (start, end) tuples; play the generated Move
+        matches = [move for move in get_all_moves(position, current, True) if move == entry[3]]
+        if len(matches) != 1:
+            break
+        move = matches[0]
+        pv.append(move)
+        position.make_move(move)
+        current = BLACK_PIECE if current == RED_PIECE else RED_PIECE
+    return pv
+
+def book_result(book, board, player, start):
+    """Returns a SearchResult for a move from book, or None when board is out of book."""
+    if book is None:
+        return None
+    move = book.choose(board, player)
+    if move is None:
+        return None
+    return SearchResult(move, None, [move], 0, 0, time.perf_counter() - start)
+
+@register_engine("alphabeta")
+class AlphaBetaEngine:
+    """Iterative-deepening alpha-beta over the bitboard with a transposition table."""
+
+    use_mtdf = False
+
+    def __init__(self, tt_mb=16, eval_cache_mb=4, quiescence=True, workers=1, parallel="root", max_depth=20,
+                 stats_stream=None, pvs=True, aspiration=True, lmr_moves=LMR_MOVES, book_path=None,
+                 tablebase_dir=None):
+        self.tt = TranspositionTable(tt_mb)
+        self.eval_cache = EvalCache(eval_cache_mb) if eval_cache_mb else None
+        self.quiescence = quiescence
+        self.workers = workers
+        self.parallel = parallel
+        self.max_depth = max_depth
+        self.pvs = pvs
+        self.aspiration = aspiration
+        self.lmr_moves = lmr_moves  # None searches every move at full depth
+        self.stats_stream = stats_stream  # File to write per-depth statistics to as JSON lines
+        self.book = OpeningBook.open_if_exists(book_path)
+        self.tablebase = Tablebase.open_if_exists(tablebase_dir)
+        self._handle = None
+
+    def search(self, board, player, limits):
+        start = time.perf_counter()
+        result = book_result(self.book, board, player, start)
+        if result is not None:
+            return result
+        handle = SearchHandle()
+        self._handle = handle
+        self.tt.new_search()
+        if self.workers > 1 and self.parallel == "lazy":
+            # Lazy SMP shares a table that lives as long as the process; age it with the private one
+            get_shared_table(self.tt.size_mb).new_search()
+        time_limit = float('inf') if limits.time is None else limits.time
+        max_depth = self.max_depth if limits.depth is None else limits.depth
+        stats = SearchStats(stream=self.stats_stream)
+        score, move, depth = iterative_deepening(board, player, time_limit, max_depth, self.tt, self.quiescence,
+                                                 self.workers, self.parallel, handle, self.eval_cache, stats,
+                                                 pvs=self.pvs, aspiration=self.aspiration, lmr_moves=self.lmr_moves,
+                                                 use_mtdf=self.use_mtdf, tablebase=self.tablebase)
+        pv = principal_variation(board, player, self.tt, depth)
+        if not pv or move is None or pv[0].path != move.path:
+            pv = [move] if move else []
+        return SearchResult(move, score, pv, depth, stats.nodes + stats.qnodes, time.perf_counter() - start, stats)
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.stop()
+
+    def new_game(self):
+        self.tt.clear()
+        if self.eval_cache is not None:
+            self.eval_cache.clear()
+
+@register_engine("mtdf")
+class MTDFEngine(AlphaBetaEngine):
+    """Iterative deepening that searches each depth with MTD(f) null-window passes."""
+    use_mtdf = True
+
+@register_engine("mcts")
+class MCTSEngine:
+    """Monte Carlo tree search; the tree is reused between moves of the same game."""
+
+    default_playouts = 2000  # Used when the limits set neither time nor nodes
+
+    def __init__(self, exploration=EXPLORATION, batch_size=BATCH_SIZE, workers=1, rollout_depth=ROLLOUT_DEPTH,
+                 seed=None, max_depth=20, book_path=None, **_ignored):
+        # Accepts and ignores the alpha-beta options so callers can switch engines by name
+        self.tree = MCTS(exploration, batch_size, workers, rollout_depth, seed)
+        self.max_depth = max_depth  # Longest principal variation reported
+        self.book = OpeningBook.open_if_exists(book_path)
+        self._handle = None
+
+    def search(self, board, player, limits):
+        start = time.perf_counter()
+        result = book_result(self.book, board, player, start)
+        if result is not None:
+            return result
+        handle = SearchHandle()
+        self._handle = handle
+        time_limit = float('inf') if limits.time is None else limits.time
+        playouts = limits.nodes
+        if playouts is None and limits.time is None:
+            playouts = self.default_playouts
+        move, score, run = self.tree.search(board, player, time_limit, playouts, handle)
+        pv = self.tree.principal_variation(self.max_depth)
+        elapsed = time.perf_counter() - start
+        return SearchResult(move, score, pv, len(pv), run, elapsed, SearchStats(nodes=run, time=elapsed))
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.stop()
+
+    def new_game(self):
+        self.tree.clear()
@@ -0,0 +1,47 @@
+from array import array
+
+# Each entry is a key (8 bytes) and a score (8 bytes)
+ENTRY_BYTES = 16
+
+class EvalCache:
+    """
+    Fixed-size, direct-mapped cache of static evaluations keyed by Zobrist key.
+    Kept apart from the transposition table: it stores only evaluate_board
+    results, so entries never depend on search depth or bounds.
+    """
+
+    def __init__(self, size_mb=4):
+        entries = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        self.size_mb = size_mb
+        self.slots = 1 << (entries.bit_length() - 1)
+        self._mask = self.slots - 1
+        self.clear()
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        self._keys = array('Q', bytes(8 * self.slots))
+        self._scores = array('d', bytes(8 * self.slots))
+        self._used = bytearray(self.slots)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Returns the evaluation stored for key, or None."""
+        i = key & self._mask
+        if self._used[i] and self._keys[i] == key:
+            self.hits += 1
+            return self._scores[i]
+        self.misses += 1
+        return None
+
+    def put(self, key, score):
+        """Stores an evaluation, replacing whatever held the slot."""
+        i = key & self._mask
+        self._keys[i] = key
+        self._scores[i] = score
+        self._used[i] = 1
+
+    def hit_rate(self):
+        """Returns the share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -1,8 +1,30 @@
 from ..game.pieces import *
-from ..game.move_generator import get_all_moves
+from ..game.move_generator import move_count
+from ..game.bitboard import BitBoard
+from ..game.zobrist import SIDE_KEY, board_key
+
+def evaluate_board(board, cache=None):
+    """
+    Evaluates the current board state.
+    With an EvalCache, positions seen before are answered from the cache.
+    """
+    if cache is None:
+        return _evaluate(board)
+    key = board.key if isinstance(board, BitBoard) else board_key(board, RED_PIECE)
+    # The score does not depend on the side to move, so both sides share one entry
+    key = min(key, key ^ SIDE_KEY)
+    score = cache.get(key)
+    if score is None:
+        score = _evaluate(board)
+        cache.put(key, score)
+    return score
+
+def _evaluate(board):
+    if isinstance(board, BitBoard):
+        # Material is kept up to date by make_move; mobility is counted from the move masks
+        mobility = move_count(board, RED_PIECE) - move_count(board, BLACK_PIECE)
+        return board.material / 2 + 0.1 * mobility
 
-def evaluate_board(board):
-    """Evaluates the current board state."""
     red_material = 0
     black_material = 0
     for row in board:
@@ -18,8 +40,8 @@ def evaluate_board(board):
     material = red_material - black_material
     
     # Consider mobility
-    red_moves = len(get_all_moves(board, RED_PIECE))
-    black_moves = len(get_all_moves(board, BLACK_PIECE))
+    red_moves = move_count(board, RED_PIECE)
+    black_moves = move_count(board, BLACK_PIECE)
     mobility = red_moves - black_moves
     
     return material + 0.1 * mobility
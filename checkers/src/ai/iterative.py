@@ -0,0 +1,184 @@
+import time
+import logging
+import threading
+from .minimax import minimax, SearchContext, SearchTimeout
+from .mtdf import mtdf
+from .stats import IterationStats, SearchStats
+from ..game.move_generator import get_all_moves
+
+# Stop deepening once this share of the budget is gone; the next depth rarely finishes
+NEXT_ITERATION_CUTOFF = 0.5
+# Half-width of the aspiration window around the guessed score, in men
+ASPIRATION_WINDOW = 0.25
+
+def move_time_budget(move_time, clock_used=0.0, game_time=None, moves_to_go=30, min_time=0.05):
+    """
+    Returns the seconds to spend on one move: the per-move budget, reduced so that
+    the remaining game clock (game_time minus clock_used) lasts for moves_to_go moves.
+    """
+    budget = move_time
+    if game_time is not None:
+        budget = min(budget, (game_time - clock_used) / moves_to_go)
+    return max(budget, min_time)
+
+class SearchHandle:
+    """
+    Lets another thread stop a running iterative_deepening and read the best
+    move from the deepest iteration completed so far.
+    """
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._finished = threading.Event()
+        self._best = (None, None, 0)
+
+    def stop(self):
+        """Asks the search to stop; it notices within CHECK_INTERVAL nodes."""
+        self._stop.set()
+
+    def is_set(self):
+        """Returns True once stop() was called; used by SearchContext as its stop flag."""
+        return self._stop.is_set()
+
+    def best_so_far(self):
+        """Returns (evaluation, best_move, depth) of the deepest completed iteration."""
+        return self._best
+
+    def done(self):
+        """Returns True once the search has returned."""
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Waits for the search to return; returns best_so_far() or None on timeout."""
+        if not self._finished.wait(timeout):
+            return None
+        return self._best
+
+def start_search(board, player, time_limit, **kwargs):
+    """
+    Runs iterative_deepening on a daemon thread and returns its SearchHandle.
+    Keyword arguments are passed on to iterative_deepening.
+    """
+    handle = SearchHandle()
+    thread = threading.Thread(target=iterative_deepening, args=(board, player, time_limit),
+                              kwargs=dict(kwargs, handle=handle), daemon=True)
+    thread.start()
+    return handle
+
+def iterative_deepening(board, player, time_limit, max_depth=20, tt=None, quiescence=True, workers=1,
+                        parallel="root", handle=None, eval_cache=None, stats=None, pvs=False, aspiration=False,
+                        lmr_moves=None, use_mtdf=False, tablebase=None):
+    """
+    Searches depth 1, 2, ... until time_limit seconds are used, max_depth is reached
+    or the search is stopped through handle. A SearchStats passed as stats is filled in.
+    With aspiration, each depth first searches a window around the score of two depths
+    back and widens it on failure. pvs enables principal variation search in minimax,
+    and lmr_moves late move reductions after that many moves. With use_mtdf each
+    depth is searched by MTD(f) from the same guess instead. A Tablebase scores the
+    positions it covers exactly.
+    Returns (evaluation, best_move, depth) from the last depth that completed.
+    """
+    if stats is None:
+        stats = SearchStats()
+    try:
+        return _deepen(board, player, time_limit, max_depth, tt, quiescence, workers, parallel, handle,
+                       eval_cache, stats, pvs, aspiration, lmr_moves, use_mtdf, tablebase)
+    finally:
+        if handle is not None:
+            handle._finished.set()
+
+def _deepen(board, player, time_limit, max_depth, tt, quiescence, workers, parallel, handle, eval_cache, stats,
+            pvs, aspiration, lmr_moves, use_mtdf, tablebase):
+    start = time.perf_counter()
+    moves = get_all_moves(board, player, True)
+    result = (None, moves[0] if moves else None, 0)
+    if handle is not None:
+        handle._best = result
+    if len(moves) <= 1:
+        # Nothing to decide
+        stats.finish()
+        return result
+
+    # One context for every depth so killers and history carry over between iterations
+    context = SearchContext(tt, quiescence=quiescence, stop=handle, eval_cache=eval_cache, pvs=pvs,
+                            lmr_moves=lmr_moves, tablebase=tablebase)
+    tt_probes, tt_hits = (tt.probes, tt.hits) if tt is not None else (0, 0)
+    previous_nodes = 0
+    for depth in range(1, max_depth + 1):
+        # Depth 1 ignores the clock so there is a searched move to play
+        context.deadline = start + time_limit if depth > 1 else None
+        depth_start = time.perf_counter()
+        nodes, qnodes = context.nodes, context.qnodes
+        try:
+            if use_mtdf:
+                guess = _aspiration_guess(stats)
+                score, move, passes = mtdf(board, depth, player, 0.0 if guess is None else guess, context,
+                                           workers, parallel)
+                stats.mtdf_passes += passes
+            else:
+                score, move = _search_depth(board, depth, player, context, workers, parallel,
+                                            _aspiration_guess(stats) if aspiration else None, stats)
+        except SearchTimeout:
+            logging.debug(f"[iterative_deepening] Depth {depth} aborted after {context.nodes} nodes")
+            stats.add_iteration(IterationStats(depth, context.nodes - nodes, context.qnodes - qnodes,
+                                               time.perf_counter() - depth_start, None, completed=False))
+            break
+        result = (score, move, depth)
+        if handle is not None:
+            handle._best = result
+        elapsed = time.perf_counter() - start
+        depth_nodes = context.nodes - nodes + context.qnodes - qnodes
+        stats.add_iteration(IterationStats(depth, context.nodes - nodes, context.qnodes - qnodes,
+                                           time.perf_counter() - depth_start,
+                                           depth_nodes / previous_nodes if previous_nodes else None, score, move))
+        previous_nodes = depth_nodes
+        logging.debug(f"[iterative_deepening] Depth {depth}: {move} score {score} "
+                      f"({context.nodes} nodes, {context.qnodes} quiescence nodes, {elapsed:.3f}s, "
+                      f"first-move cutoffs {context.first_move_cutoff_rate():.0%})")
+        if eval_cache is not None:
+            logging.debug(f"[iterative_deepening] Eval cache: {eval_cache.hits} hits, "
+                          f"{eval_cache.misses} misses ({eval_cache.hit_rate():.0%})")
+        if elapsed >= time_limit * NEXT_ITERATION_CUTOFF:
+            break
+
+    stats.nodes = context.nodes
+    stats.qnodes = context.qnodes
+    stats.time = time.perf_counter() - start
+    stats.beta_cutoffs = context.beta_cutoffs
+    stats.first_move_cutoffs = context.first_move_cutoffs
+    stats.pvs_researches = context.pvs_researches
+    stats.lmr_reductions = context.lmr_reductions
+    stats.lmr_researches = context.lmr_researches
+    stats.tablebase_hits = context.tablebase_hits
+    if tt is not None:
+        stats.tt_probes = tt.probes - tt_probes
+        stats.tt_hits = tt.hits - tt_hits
+    stats.finish()
+    return result
+
+def _search_depth(board, depth, player, context, workers, parallel, guess, stats):
+    """
+    Searches one depth. With a guess, starts from a window of ASPIRATION_WINDOW
+    around it and re-searches with the failing side opened up until the score
+    falls inside the window.
+    """
+    if guess is None or guess in (float('inf'), float('-inf')):
+        return minimax(board, depth, True, -float('inf'), float('inf'), player, context, workers, parallel)
+    alpha, beta = guess - ASPIRATION_WINDOW, guess + ASPIRATION_WINDOW
+    while True:
+        score, move = minimax(board, depth, True, alpha, beta, player, context, workers, parallel)
+        if score <= alpha:
+            alpha = -float('inf')
+        elif score >= beta:
+            beta = float('inf')
+        else:
+            return score, move
+        stats.aspiration_researches += 1
+
+def _aspiration_guess(stats):
+    """
+    Returns the score of two depths back: the side that moves last alternates with
+    depth, so scores swing between odd and even depths but stay close within one.
+    """
+    completed = [iteration for iteration in stats.iterations if iteration.completed]
+    return completed[-2].score if len(completed) >= 2 else None
@@ -0,0 +1,188 @@
+import math
+import random
+import time
+from .evaluator import evaluate_board
+from .ordering import MoveOrderer
+from .parallel import get_pool, encode_position, decode_position
+from ..game.bitboard import BitBoard, get_all_moves
+from ..game.pieces import RED_PIECE, BLACK_PIECE
+
+EXPLORATION = 1.4  # UCT exploration constant
+PW_CONSTANT = 1.0  # Progressive widening: a node may have PW_CONSTANT * visits ** PW_EXPONENT children
+PW_EXPONENT = 0.5
+BATCH_SIZE = 8  # Playouts selected before their rollouts are run together
+ROLLOUT_DEPTH = 40  # Plies played out before the rollout is scored by the evaluator
+ROLLOUT_SCALE = 1.0  # Evaluation that maps to a win probability of about 73%
+REUSE_DEPTH = 2  # How many plies below the old root to look for the new position
+
+def other(player):
+    return BLACK_PIECE if player == RED_PIECE else RED_PIECE
+
+class Node:
+    """One position in the tree. value sums results for the side that moved into it."""
+    __slots__ = ("move", "parent", "player", "key", "children", "untried", "visits", "value")
+
+    def __init__(self, move, parent, player, key):
+        self.move = move
+        self.parent = parent
+        self.player = player  # Side to move in this position
+        self.key = key
+        self.children = []
+        self.untried = None  # Moves not yet expanded, best-first; filled on the first visit
+        self.visits = 0
+        self.value = 0.0
+
+    def mean(self):
+        return self.value / self.visits if self.visits else 0.0
+
+def red_win_probability(position, player, rng, depth=ROLLOUT_DEPTH):
+    """
+    Plays random moves from position for up to depth plies. A side left without
+    moves loses; otherwise the evaluation is squashed into a probability.
+    Returns the probability that red wins.
+    """
+    for _ in range(depth):
+        moves = get_all_moves(position, player)
+        if not moves:
+            return 0.0 if player == RED_PIECE else 1.0
+        position.make_move(rng.choice(moves))
+        player = other(player)
+    return 1.0 / (1.0 + math.exp(-evaluate_board(position) / ROLLOUT_SCALE))
+
+def rollout_batch(jobs, seed, depth=ROLLOUT_DEPTH):
+    """Runs a rollout for each (encoded position, player) and returns red's win probabilities."""
+    rng = random.Random(seed)
+    return [red_win_probability(decode_position(encoded), player, rng, depth) for encoded, player in jobs]
+
+class MCTS:
+    """
+    Monte Carlo tree search with UCT selection and progressive widening.
+    The tree is kept between searches so a position reached by the expected
+    replies starts from the statistics already gathered for it.
+    """
+
+    def __init__(self, exploration=EXPLORATION, batch_size=BATCH_SIZE, workers=1,
+                 rollout_depth=ROLLOUT_DEPTH, seed=None):
+        self.exploration = exploration
+        self.batch_size = batch_size
+        self.workers = workers
+        self.rollout_depth = rollout_depth
+        self.rng = random.Random(seed)
+        self.orderer = MoveOrderer()
+        self.root = None
+        self.reused = 0  # Visits carried over into the last search's root
+
+    def clear(self):
+        self.root = None
+
+    def search(self, board, player, time_limit=float('inf'), playouts=None, stop=None):
+        """
+        Grows the tree from board with player to move until time_limit seconds
+        pass, playouts rollouts have been run or stop is set.
+        Returns (best_move, win_probability, playouts)
+        """
+        deadline = time.perf_counter() + time_limit
+        root_position = BitBoard.from_board(board, player)
+        self.root = self._find_root(root_position.key, player)
+        self.reused = self.root.visits
+        run = 0
+        while playouts is None or run < playouts:
+            if stop is not None and stop.is_set() or time.perf_counter() >= deadline:
+                break
+            count = self.batch_size if playouts is None else min(self.batch_size, playouts - run)
+            run += self._run_batch(root_position, count)
+        best = self.best_child(self.root)
+        if best is None:
+            return None, None, run
+        return best.move, best.mean(), run
+
+    def best_child(self, node):
+        """Returns the most visited child, or None for an unexpanded node."""
+        return max(node.children, key=lambda child: child.visits, default=None)
+
+    def principal_variation(self, max_length):
+        pv = []
+        node = self.root
+        while node is not None and len(pv) < max_length:
+            node = self.best_child(node)
+            if node is None or node.visits == 0:
+                break
+            pv.append(node.move)
+        return pv
+
+    def _find_root(self, key, player):
+        """Returns the node for key within REUSE_DEPTH plies of the old root, detached, or a new node."""
+        level = [self.root] if self.root is not None else []
+        for _ in range(REUSE_DEPTH + 1):
+            for node in level:
+                if node.key == key and node.player == player:
+                    node.parent = None
+                    node.move = None
+                    return node
+            level = [child for node in level for child in node.children]
+        return Node(None, None, player, key)
+
+    def _run_batch(self, root_position, count):
+        """Selects up to count leaves, runs their rollouts and backs the results up."""
+        leaves = []
+        jobs = []
+        for _ in range(count):
+            position = root_position.copy()
+            node = self._select(position)
+            leaves.append(node)
+            jobs.append((encode_position(position), node.player))
+        seed = self.rng.getrandbits(32)
+        if self.workers > 1:
+            pool = get_pool(self.workers)
+            chunk = max(1, len(jobs) // self.workers)
+            futures = [pool.submit(rollout_batch, jobs[i:i + chunk], seed + i, self.rollout_depth)
+                       for i in range(0, len(jobs), chunk)]
+            results = [result for future in futures for result in future.result()]
+        else:
+            results = rollout_batch(jobs, seed, self.rollout_depth)
+        for node, red_wins in zip(leaves, results):
+            self._backpropagate(node, red_wins)
+        return len(leaves)
+
+    def _select(self, position):
+        """
+        Walks from the root to a leaf, expanding one move where widening allows,
+        and plays the path's moves on position. Visits are counted on the way
+        down so the rest of the batch is steered away from pending playouts.
+        """
+        node = self.root
+        node.visits += 1
+        while True:
+            if node.untried is None:
+                moves = get_all_moves(position, node.player)
+                node.untried = self.orderer.order(position, moves, None, 0)
+            widen = len(node.children) < max(1, int(PW_CONSTANT * node.visits ** PW_EXPONENT))
+            if node.untried and (widen or not node.children):
+                move = node.untried.pop(0)
+                position.make_move(move)
+                child = Node(move, node, other(node.player), position.key)
+                node.children.append(child)
+                child.visits += 1
+                return child
+            if not node.children:
+                return node  # No moves: the rollout scores the loss straight away
+            node = self._uct_child(node)
+            position.make_move(node.move)
+            node.visits += 1
+
+    def _uct_child(self, node):
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+
+        def uct(child):
+            if child.visits == 0:
+                return float('inf')
+            return child.value / child.visits + exploration * math.sqrt(log_visits / child.visits)
+
+        return max(node.children, key=uct)
+
+    def _backpropagate(self, node, red_wins):
+        while node.parent is not None:
+            mover = node.parent.player
+            node.value += red_wins if mover == RED_PIECE else 1.0 - red_wins
+            node = node.parent
@@ -1,51 +1,265 @@
+import time
 from .evaluator import evaluate_board
-from ..game.move_generator import get_possible_moves, get_all_moves, apply_move
+from .tablebase import tablebase_score
+from .transposition import EXACT, LOWER, UPPER, side_relative
+from .ordering import MoveOrderer, captured_count, is_promotion
+from ..game.move_generator import get_all_moves
 from ..game.pieces import RED_PIECE, BLACK_PIECE
+from ..game.bitboard import BitBoard, can_capture
 
-def minimax(board, depth, maximizing, alpha, beta, player):
+# Nodes between clock checks; must be a power of two minus one
+CHECK_INTERVAL = 1023
+
+# Width of PVS null windows; far below the 0.1 step between evaluations
+NULL_WINDOW = 1e-6
+
+# Late move reductions: quiet moves after the first LMR_MOVES are searched
+# LMR_REDUCTION plies shallower at nodes with at least LMR_MIN_DEPTH plies left
+LMR_MOVES = 3
+LMR_MIN_DEPTH = 3
+LMR_REDUCTION = 1
+
+class SearchTimeout(Exception):
+    """Raised inside the search when its deadline has passed or it was told to stop."""
+
+class SearchContext:
+    """State shared by every node of a search: tables, move ordering, deadline and counters."""
+
+    def __init__(self, tt=None, deadline=None, orderer=None, quiescence=False, stop=None, eval_cache=None,
+                 pvs=False, lmr_moves=None, tablebase=None):
+        self.tt = tt
+        self.eval_cache = eval_cache
+        self.deadline = deadline  # time.perf_counter() value, or None for no limit
+        self.stop = stop  # Any object with is_set(), e.g. threading.Event
+        self.orderer = MoveOrderer() if orderer is None else orderer
+        self.quiescence = quiescence  # Resolve pending captures below depth 0
+        self.pvs = pvs  # Search moves after the first with a null window
+        self.lmr_moves = lmr_moves  # Moves searched at full depth before reducing; None disables LMR
+        self.tablebase = tablebase  # Endgame tables answering positions with few pieces exactly
+        self.nodes = 0
+        self.qnodes = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.pvs_researches = 0
+        self.lmr_reductions = 0
+        self.lmr_researches = 0
+        self.tablebase_hits = 0
+
+    def first_move_cutoff_rate(self):
+        """Returns the share of beta cutoffs produced by the first move searched."""
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    def check_time(self):
+        """Raises SearchTimeout once the deadline has passed or the stop flag is set."""
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        if self.stop is not None and self.stop.is_set():
+            raise SearchTimeout()
+
+def minimax(board, depth, maximizing, alpha, beta, player, context=None, workers=1, parallel="root"):
     """
-    Implements minimax algorithm with alpha-beta pruning.
+    Implements minimax algorithm with alpha-beta pruning. Scores are from
+    player's point of view; maximizing is True when player is to move.
+    With workers > 1 the search runs across a process pool, either splitting the
+    root moves (parallel="root") or as Lazy SMP over a shared table (parallel="lazy").
     Returns (evaluation, best_move)
     """
     if depth < 0:
         raise ValueError("Depth must be non-negative")
-        
+    if context is None:
+        context = SearchContext()
+    # Search on a private packed position that is updated with make/unmake
+    if isinstance(board, BitBoard):
+        position = board.copy()
+    else:
+        to_move = player if maximizing else (BLACK_PIECE if player == RED_PIECE else RED_PIECE)
+        position = BitBoard.from_board(board, to_move)
+    if workers > 1 and depth > 1:
+        from . import parallel as parallel_search  # parallel imports this module
+        # Workers keep tables of the size this search was given
+        tt_mb = context.tt.size_mb if context.tt is not None else None
+        if parallel == "lazy":
+            return parallel_search.lazy_smp_search(position, depth, maximizing, alpha, beta, player, context,
+                                                   workers, tt_mb or parallel_search.LAZY_SMP_TT_MB)
+        return parallel_search.parallel_root_search(position, depth, maximizing, alpha, beta, player, context,
+                                                    workers, tt_mb)
+    return alphabeta(position, depth, maximizing, alpha, beta, player, context)
+
+def alphabeta(position, depth, maximizing, alpha, beta, player, context, ply=0):
+    """
+    Alpha-beta over a mutable BitBoard; every move is unmade before returning.
+    Returns (evaluation, best_move)
+    """
+    context.nodes += 1
+    if not context.nodes & CHECK_INTERVAL:
+        context.check_time()
     opponent_player = BLACK_PIECE if player == RED_PIECE else RED_PIECE
-    moves = get_all_moves(board, player if maximizing else opponent_player, True)
+    # Positions in the endgame tables are scored exactly; the root still searches for a move
+    if context.tablebase is not None and ply > 0:
+        to_move = player if maximizing else opponent_player
+        value = context.tablebase.probe(position, to_move)
+        if value is not None:
+            context.tablebase_hits += 1
+            score = tablebase_score(value)
+            return (score if maximizing else -score), None
+    if depth == 0:
+        if context.quiescence:
+            return _quiescence(position, maximizing, alpha, beta, player, context), None
+        return _evaluate(position, player, context), None
+
+    tt = context.tt
+    hash_move = None
+    if tt is not None:
+        key = position.key
+        entry = tt.probe(key)
+        if entry is not None:
+            entry_depth, entry_score, bound, hash_move = entry
+            entry_score, bound = side_relative(entry_score, bound, maximizing)
+            # The root always searches so that it has a move to return
+            if ply > 0 and entry_depth >= depth:
+                if bound == EXACT:
+                    return entry_score, hash_move
+                if bound == LOWER:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+                if beta <= alpha:
+                    return entry_score, hash_move
+        
+    moves = get_all_moves(position, player if maximizing else opponent_player, True)
     
-    if depth == 0 or not moves:
-        return evaluate_board(board), None
+    if not moves:
+        return _evaluate(position, player, context), None
+
+    moves = context.orderer.order(position, moves, hash_move, ply)
 
+    alpha_orig, beta_orig = alpha, beta
     best_move = None
+    # Principal variation search: once a move has set the bound, later moves only
+    # need to show they are no better, which a null window proves cheaply
+    pvs = context.pvs and beta - alpha > NULL_WINDOW
+    lmr_moves = context.lmr_moves if depth >= LMR_MIN_DEPTH else None
     if maximizing:
-        max_eval = float('-inf')
-        for move in moves:
-            current = player if maximizing else opponent_player
-            new_board = apply_move(board, move, current)
-            eval_score, _ = minimax(new_board, depth - 1, False, alpha, beta, player)
+        best_eval = float('-inf')
+        for index, move in enumerate(moves):
+            reduce = lmr_moves is not None and index >= lmr_moves and _is_quiet(position, move)
+            undo = position.make_move(move)
+            eval_score = _search_move(position, depth, True, alpha, beta, player, context, ply,
+                                      pvs and index > 0, reduce)
+            position.unmake_move(undo)
             
-            if eval_score > max_eval:
-                max_eval = eval_score
+            if eval_score > best_eval:
+                best_eval = eval_score
                 best_move = move
                 
             alpha = max(alpha, eval_score)
             if beta <= alpha:
+                _record_cutoff(context, position, move, index, ply, depth)
                 break
-        return max_eval, best_move
     else:
-        min_eval = float('inf')
-        for move in moves:
-            current = player if maximizing else opponent_player
-            new_board = apply_move(board, move, current)
-            eval_score, _ = minimax(new_board, depth - 1, True, alpha, beta, player)
+        best_eval = float('inf')
+        for index, move in enumerate(moves):
+            reduce = lmr_moves is not None and index >= lmr_moves and _is_quiet(position, move)
+            undo = position.make_move(move)
+            eval_score = _search_move(position, depth, False, alpha, beta, player, context, ply,
+                                      pvs and index > 0, reduce)
+            position.unmake_move(undo)
             
-            if eval_score < min_eval:
-                min_eval = eval_score
+            if eval_score < best_eval:
+                best_eval = eval_score
                 best_move = move
                 
             beta = min(beta, eval_score)
             if beta <= alpha:
+                _record_cutoff(context, position, move, index, ply, depth)
                 break
-        return min_eval, best_move
 
+    if tt is not None:
+        if best_eval <= alpha_orig:
+            bound = UPPER
+        elif best_eval >= beta_orig:
+            bound = LOWER
+        else:
+            bound = EXACT
+        tt.store(key, depth, *side_relative(best_eval, bound, maximizing), best_move)
+    return best_eval, best_move
+
+def _search_move(position, depth, maximizing, alpha, beta, player, context, ply, scout, reduce):
+    """
+    Searches the reply to a move just made at a node where maximizing is to move.
+    A scouted move is first tried with a null window next to the bound, and a
+    reduced one at a shallower depth; either is re-searched with the full window
+    and depth only if it might raise the bound.
+    """
+    bound_set = alpha > float('-inf') if maximizing else beta < float('inf')
+    if bound_set and (scout or reduce):
+        low, high = (alpha, alpha + NULL_WINDOW) if maximizing else (beta - NULL_WINDOW, beta)
+        if reduce:
+            context.lmr_reductions += 1
+            eval_score, _ = alphabeta(position, depth - 1 - LMR_REDUCTION, not maximizing, low, high, player,
+                                      context, ply + 1)
+            if (eval_score <= alpha) if maximizing else (eval_score >= beta):
+                return eval_score
+            context.lmr_researches += 1
+        if scout:
+            eval_score, _ = alphabeta(position, depth - 1, not maximizing, low, high, player, context, ply + 1)
+            if not alpha < eval_score < beta:
+                return eval_score
+            context.pvs_researches += 1
+    eval_score, _ = alphabeta(position, depth - 1, not maximizing, alpha, beta, player, context, ply + 1)
+    return eval_score
+
+def _evaluate(position, player, context):
+    """Static evaluation from player's point of view; evaluate_board scores red against black."""
+    score = evaluate_board(position, context.eval_cache)
+    return score if player == RED_PIECE else -score
+
+def _is_quiet(position, move):
+    """Returns True for a move that neither captures nor promotes."""
+    return not captured_count(move) and not is_promotion(position, move)
+
+def _quiescence(position, maximizing, alpha, beta, player, context):
+    """
+    Searches capture sequences until the side to move has no capture, using the
+    static evaluation as a stand-pat bound for the side to move.
+    """
+    context.qnodes += 1
+    if not context.qnodes & CHECK_INTERVAL:
+        context.check_time()
+    current = player if maximizing else (BLACK_PIECE if player == RED_PIECE else RED_PIECE)
+    stand_pat = _evaluate(position, player, context)
+    if not can_capture(position, current):
+        return stand_pat
+
+    best_eval = stand_pat
+    if maximizing:
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        for move in get_all_moves(position, current, True):
+            undo = position.make_move(move)
+            eval_score = _quiescence(position, False, alpha, beta, player, context)
+            position.unmake_move(undo)
+            best_eval = max(best_eval, eval_score)
+            alpha = max(alpha, eval_score)
+            if beta <= alpha:
+                break
+    else:
+        if stand_pat <= alpha:
+            return stand_pat
+        beta = min(beta, stand_pat)
+        for move in get_all_moves(position, current, True):
+            undo = position.make_move(move)
+            eval_score = _quiescence(position, True, alpha, beta, player, context)
+            position.unmake_move(undo)
+            best_eval = min(best_eval, eval_score)
+            beta = min(beta, eval_score)
+            if beta <= alpha:
+                break
+    return best_eval
 
+def _record_cutoff(context, position, move, index, ply, depth):
+    context.beta_cutoffs += 1
+    if index == 0:
+        context.first_move_cutoffs += 1
+    context.orderer.record_cutoff(position, move, ply, depth)
@@ -0,0 +1,24 @@
+from .minimax import minimax, NULL_WINDOW
+
+def mtdf(board, depth, player, guess, context, workers=1, parallel="root"):
+    """
+    MTD(f): converges on the minimax value with null-window searches around a
+    guess, narrowing a lower and an upper bound until they meet. Relies on the
+    context's transposition table to make the repeated searches cheap.
+    Returns (evaluation, best_move, passes)
+    """
+    lower, upper = float('-inf'), float('inf')
+    score = guess
+    best_move = None
+    passes = 0
+    while lower < upper:
+        beta = score + NULL_WINDOW if score == lower else score
+        score, move = minimax(board, depth, True, beta - NULL_WINDOW, beta, player, context, workers, parallel)
+        passes += 1
+        if score < beta:
+            upper = score
+        else:
+            lower = score
+            # Only a search that failed high proved its move reaches the bound
+            best_move = move
+    return score, best_move or move, passes
@@ -0,0 +1,90 @@
+import random
+from ..game.bitboard import ROW_0, ROW_7, popcount
+from ..game.move import Move
+
+# Sort keys by move class; each class outranks every score of the classes below it
+HASH_MOVE_SCORE = 1 << 48
+CAPTURE_SCORE = 1 << 44     # Plus the number of pieces taken
+PROMOTION_SCORE = 1 << 40
+KILLER_SCORE = 1 << 36      # Plus one for the most recent killer
+HISTORY_LIMIT = 1 << 30     # History scores are halved once one passes this
+
+MAX_PLY = 128
+
+def move_index(move):
+    """Returns a 0-4095 index for ((r, c), (r, c)) used by the history table."""
+    (sr, sc), (er, ec) = move
+    return (sr * 8 + sc) * 64 + er * 8 + ec
+
+def captured_count(move):
+    """Returns the number of pieces a move takes."""
+    if isinstance(move, Move):
+        return popcount(move.captured)
+    (sr, _), (er, _) = move
+    return abs(er - sr) // 2
+
+def is_promotion(position, move):
+    """Returns True when a man moves onto its crowning row."""
+    if isinstance(move, Move):
+        return move.promotion
+    (sr, sc), (er, ec) = move
+    if er != 0 and er != 7:
+        return False
+    start = position.square_at(sr, sc)
+    end = position.square_at(er, ec)
+    if position.kings >> start & 1:
+        return False
+    crown_row = ROW_0 if position.red >> start & 1 else ROW_7
+    return bool(crown_row >> end & 1)
+
+class MoveOrderer:
+    """
+    Orders moves for alpha-beta: hash move, captures by pieces taken, promotions,
+    two killer moves per ply, then the remaining quiet moves by history score.
+    """
+
+    def __init__(self, seed=None):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        if seed is None:
+            self.history = [0] * 4096
+        else:
+            # Small random history scores break quiet-move ties differently per seed
+            rng = random.Random(seed)
+            self.history = [rng.randrange(16) for _ in range(4096)]
+
+    def order(self, position, moves, hash_move, ply):
+        """Returns moves sorted best-first; ties keep generator order."""
+        if len(moves) < 2:
+            return moves
+        first_killer, second_killer = self.killers[ply] if ply < MAX_PLY else (None, None)
+        history = self.history
+
+        def score(move):
+            if move == hash_move:
+                return HASH_MOVE_SCORE
+            taken = captured_count(move)
+            if taken:
+                return CAPTURE_SCORE + taken
+            if is_promotion(position, move):
+                return PROMOTION_SCORE
+            if move == first_killer:
+                return KILLER_SCORE + 1
+            if move == second_killer:
+                return KILLER_SCORE
+            return history[move_index(move)]
+
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, position, move, ply, depth):
+        """Credits a quiet move that caused a beta cutoff."""
+        if captured_count(move) or is_promotion(position, move):
+            return
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        index = move_index(move)
+        self.history[index] += depth * depth
+        if self.history[index] > HISTORY_LIMIT:
+            self.history = [value // 2 for value in self.history]
@@ -0,0 +1,296 @@
+import atexit
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker
+from .eval_cache import EvalCache
+from .minimax import SearchContext, SearchTimeout, alphabeta, _search_move, _is_quiet, LMR_MIN_DEPTH, NULL_WINDOW
+from .ordering import MoveOrderer
+from .tablebase import Tablebase
+from .transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, UPPER, side_relative
+from ..game.bitboard import BitBoard
+from ..game.move import encode_move, decode_move
+from ..game.move_generator import get_all_moves
+from ..game.pieces import RED_PIECE, BLACK_PIECE
+
+# Long-lived pools keyed by worker count, shut down when the interpreter exits
+_pools = {}
+# Per-process transposition table, evaluation cache and tablebases used by pool workers between calls
+_worker_tt = None
+_worker_cache = None
+_worker_tablebases = {}
+# Shared table size used when the search has no table of its own to match
+LAZY_SMP_TT_MB = 16
+# Shared tables: created ones keyed by size in the searching process,
+# attached ones keyed by name in the workers
+_shared_tables = {}
+# Stop flag of the root split, handed to the workers of every pool when they start
+_root_stop = None
+# Seconds between the root split's checks for a stop request while its workers search
+STOP_POLL_SECONDS = 0.01
+
+def get_root_stop():
+    """Returns the event the root split sets to stop its workers, creating it once."""
+    global _root_stop
+    if _root_stop is None:
+        _root_stop = multiprocessing.Event()
+    return _root_stop
+
+def _init_worker(root_stop):
+    global _root_stop
+    _root_stop = root_stop
+
+def get_pool(workers):
+    """Returns the shared process pool with the given number of workers."""
+    pool = _pools.get(workers)
+    if pool is None:
+        # Start the resource tracker first so forked workers share it for the shared tables
+        resource_tracker.ensure_running()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(get_root_stop(),))
+        _pools[workers] = pool
+    return pool
+
+def shutdown_pools():
+    """Stops every worker process started by get_pool and frees shared tables."""
+    for pool in _pools.values():
+        pool.shutdown(cancel_futures=True)
+    _pools.clear()
+    for table in _shared_tables.values():
+        table.close()
+    _shared_tables.clear()
+
+atexit.register(shutdown_pools)
+
+def encode_position(position):
+    """Packs a BitBoard into a tuple of ints for sending to a worker."""
+    return (position.red, position.black, position.kings, position.mirrored, position.key)
+
+def decode_position(encoded):
+    """Rebuilds a BitBoard packed by encode_position."""
+    red, black, kings, mirrored, key = encoded
+    return BitBoard(red, black, kings, mirrored, key)
+
+def _worker_table(tt_mb):
+    global _worker_tt
+    if not tt_mb:
+        return None
+    if _worker_tt is None or _worker_tt.size_mb != tt_mb:
+        _worker_tt = TranspositionTable(tt_mb)
+    _worker_tt.new_search()
+    return _worker_tt
+
+def _worker_eval_cache(size_mb):
+    global _worker_cache
+    if not size_mb:
+        return None
+    if _worker_cache is None or _worker_cache.size_mb != size_mb:
+        _worker_cache = EvalCache(size_mb)
+    return _worker_cache
+
+def _worker_tablebase(directory):
+    if directory is None:
+        return None
+    if directory not in _worker_tablebases:
+        _worker_tablebases[directory] = Tablebase(directory)
+    return _worker_tablebases[directory]
+
+def worker_options(context):
+    """Returns the search options of context in the picklable form worker_context takes."""
+    return {
+        "quiescence": context.quiescence,
+        "pvs": context.pvs,
+        "lmr_moves": context.lmr_moves,
+        "eval_cache_mb": context.eval_cache.size_mb if context.eval_cache is not None else None,
+        "tablebase_dir": context.tablebase.directory if context.tablebase is not None else None,
+    }
+
+def worker_context(options, tt, deadline, orderer=None, stop=None):
+    """Builds a worker's SearchContext that searches like the one worker_options was taken from."""
+    return SearchContext(tt, deadline, orderer, options["quiescence"], stop,
+                         _worker_eval_cache(options["eval_cache_mb"]), options["pvs"], options["lmr_moves"],
+                         _worker_tablebase(options["tablebase_dir"]))
+
+def search_root_move(encoded, code, depth, maximizing, alpha, beta, player, scout, reduce, options, orderer,
+                     time_left=None, tt_mb=None):
+    """
+    Worker entry point: plays one root move, packed by encode_move, and searches
+    the reply the way the serial root would, with a null window when scout is set
+    and a reduced depth first when reduce is. Stops when the root split's stop event is set.
+    Returns (evaluation, nodes, quiescence nodes, history after the search).
+    """
+    position = decode_position(encoded)
+    position.make_move(decode_move(code))
+    deadline = time.perf_counter() + time_left if time_left is not None else None
+    context = worker_context(options, _worker_table(tt_mb), deadline, orderer, _root_stop)
+    score = _search_move(position, depth, maximizing, alpha, beta, player, context, 0, scout, reduce)
+    return score, context.nodes, context.qnodes, orderer.history
+
+def parallel_root_search(position, depth, maximizing, alpha, beta, player, context, workers, tt_mb=None):
+    """
+    Young-brothers-wait split at the root: the first move is searched here to set
+    the bound, then the remaining moves are searched in parallel against it.
+    Picks the same move as the serial search would for the same move order.
+    Late move reductions depend on the killers and history each process has
+    learned, so with them on the two can differ where a reduction hides a move.
+    Returns (evaluation, best_move)
+    """
+    current = player if maximizing else (BLACK_PIECE if player == RED_PIECE else RED_PIECE)
+    moves = get_all_moves(position, current, True)
+    if not moves:
+        return alphabeta(position, 0, maximizing, alpha, beta, player, context)
+
+    tt = context.tt
+    key = position.key
+    hash_move = None
+    if tt is not None:
+        entry = tt.probe(key)
+        if entry is not None:
+            hash_move = entry[3]
+    moves = context.orderer.order(position, moves, hash_move, 0)
+    context.nodes += 1
+
+    alpha_orig, beta_orig = alpha, beta
+    undo = position.make_move(moves[0])
+    best_eval, _ = alphabeta(position, depth - 1, not maximizing, alpha, beta, player, context, 1)
+    position.unmake_move(undo)
+    best_move = moves[0]
+    if maximizing:
+        alpha = max(alpha, best_eval)
+    else:
+        beta = min(beta, best_eval)
+
+    if alpha < beta and len(moves) > 1:
+        encoded = encode_position(position)
+        time_left = None
+        if context.deadline is not None:
+            time_left = context.deadline - time.perf_counter()
+        # Each move gets the null window and reduction it would get in the serial search,
+        # and starts from the move ordering the first move left behind
+        pvs = context.pvs and beta_orig - alpha_orig > NULL_WINDOW
+        lmr_moves = context.lmr_moves if depth >= LMR_MIN_DEPTH else None
+        options = worker_options(context)
+        stop = get_root_stop()
+        stop.clear()
+        pool = get_pool(workers)
+        futures = [pool.submit(search_root_move, encoded, encode_move(move), depth, maximizing, alpha, beta, player,
+                               pvs, lmr_moves is not None and index >= lmr_moves and _is_quiet(position, move),
+                               options, context.orderer, time_left, tt_mb)
+                   for index, move in enumerate(moves[1:], 1)]
+        try:
+            # Wait in slices so a stop request or the deadline reaches the workers too
+            pending = futures
+            while pending:
+                context.check_time()
+                _, pending = wait(pending, timeout=STOP_POLL_SECONDS)
+            results = [future.result() for future in futures]
+        except SearchTimeout:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            # Let the running workers wind down so the next search starts with an idle pool
+            wait(futures)
+            raise
+        # Credit the workers' cutoffs to the history the next iteration orders by
+        history = context.orderer.history
+        merged = list(history)
+        for _, _, _, worker_history in results:
+            for i, value in enumerate(worker_history):
+                if value != history[i]:
+                    merged[i] += value - history[i]
+        context.orderer.history = merged
+        # Replay the results in order so ties and cutoffs resolve as in the serial search
+        for move, (score, nodes, qnodes, _) in zip(moves[1:], results):
+            context.nodes += nodes
+            context.qnodes += qnodes
+            if (score > best_eval) if maximizing else (score < best_eval):
+                best_eval = score
+                best_move = move
+                if (best_eval >= beta) if maximizing else (best_eval <= alpha):
+                    break
+
+    if tt is not None:
+        if best_eval <= alpha_orig:
+            bound = UPPER
+        elif best_eval >= beta_orig:
+            bound = LOWER
+        else:
+            bound = EXACT
+        tt.store(key, depth, *side_relative(best_eval, bound, maximizing), best_move)
+    return best_eval, best_move
+
+def get_shared_table(size_mb):
+    """Returns the shared transposition table of the given size, creating it once."""
+    table = _shared_tables.get(size_mb)
+    if table is None:
+        table = SharedTranspositionTable(size_mb)
+        _shared_tables[size_mb] = table
+    return table
+
+def _attach_table(name):
+    table = _shared_tables.get(name)
+    if table is None:
+        table = SharedTranspositionTable.attach(name)
+        _shared_tables[name] = table
+    return table
+
+def lazy_smp_helper(table_name, encoded, depth, maximizing, alpha, beta, player, options,
+                    time_left=None, seed=None):
+    """
+    Worker entry point for Lazy SMP: searches the whole root through the shared
+    table until done or told to stop. Returns (nodes, quiescence nodes).
+    """
+    table = _attach_table(table_name)
+    deadline = time.perf_counter() + time_left if time_left is not None else None
+    context = worker_context(options, table, deadline, MoveOrderer(seed), table.stop)
+    try:
+        alphabeta(decode_position(encoded), depth, maximizing, alpha, beta, player, context)
+    except SearchTimeout:
+        pass
+    return context.nodes, context.qnodes
+
+def lazy_smp_search(position, depth, maximizing, alpha, beta, player, context, workers, tt_mb=LAZY_SMP_TT_MB):
+    """
+    Lazy SMP: helper processes search the same root at depth or depth + 1 with
+    differently seeded move ordering, all sharing one transposition table, while
+    this process runs the main search. Helpers fill the table ahead of the main
+    search; only its result is returned.
+    Returns (evaluation, best_move)
+    """
+    table = get_shared_table(tt_mb)
+    table.stop.clear()
+    encoded = encode_position(position)
+    time_left = None
+    if context.deadline is not None:
+        time_left = context.deadline - time.perf_counter()
+    options = worker_options(context)
+    pool = get_pool(workers - 1)
+    futures = [pool.submit(lazy_smp_helper, table.name, encoded, depth + i % 2, maximizing,
+                           alpha, beta, player, options, time_left, i)
+               for i in range(1, workers)]
+
+    main = SearchContext(table, context.deadline, context.orderer, context.quiescence, context.stop,
+                         context.eval_cache, context.pvs, context.lmr_moves, context.tablebase)
+    try:
+        result = alphabeta(position, depth, maximizing, alpha, beta, player, main)
+    finally:
+        table.stop.set()
+        for future in futures:
+            nodes, qnodes = future.result()
+            context.nodes += nodes
+            context.qnodes += qnodes
+        context.nodes += main.nodes
+        context.qnodes += main.qnodes
+        context.beta_cutoffs += main.beta_cutoffs
+        context.first_move_cutoffs += main.first_move_cutoffs
+        context.pvs_researches += main.pvs_researches
+        context.lmr_reductions += main.lmr_reductions
+        context.lmr_researches += main.lmr_researches
+        context.tablebase_hits += main.tablebase_hits
+
+    if context.tt is not None:
+        # Keep the caller's table in step so the next iteration has a hash move
+        key = position.key
+        entry = table.probe(key)
+        if entry is not None:
+            context.tt.store(key, *entry)
+    return result
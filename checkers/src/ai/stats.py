@@ -0,0 +1,76 @@
+import json
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, TextIO
+
+@dataclass
+class IterationStats:
+    """Counters for one depth of iterative deepening."""
+    depth: int
+    nodes: int
+    qnodes: int
+    time: float  # Seconds spent on this depth
+    ebf: Optional[float]  # Effective branching factor: nodes over the previous depth's nodes
+    score: Optional[float] = None
+    move: Optional[tuple] = None
+    completed: bool = True  # False when the clock or a stop cut the depth short
+
+@dataclass
+class SearchStats:
+    """
+    Counters for a whole search. Pass one to iterative_deepening to have it filled;
+    with a stream, each depth and the final totals are also written as JSON lines.
+    """
+    nodes: int = 0
+    qnodes: int = 0
+    time: float = 0.0  # Seconds
+    beta_cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    pvs_researches: int = 0  # Null-window searches that had to be repeated with the full window
+    aspiration_researches: int = 0  # Depths re-searched after the score left the aspiration window
+    lmr_reductions: int = 0  # Moves searched at reduced depth
+    lmr_researches: int = 0  # Reduced moves that had to be searched again at full depth
+    mtdf_passes: int = 0  # Null-window searches made by MTD(f)
+    tablebase_hits: int = 0  # Positions scored from the endgame tables
+    tt_probes: int = 0
+    tt_hits: int = 0
+    iterations: List[IterationStats] = field(default_factory=list)
+    stream: Optional[TextIO] = field(default=None, repr=False, compare=False)
+
+    @property
+    def nps(self):
+        """Nodes, including quiescence nodes, per second."""
+        return (self.nodes + self.qnodes) / self.time if self.time > 0 else 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def add_iteration(self, iteration):
+        """Records a finished or aborted depth and streams it."""
+        self.iterations.append(iteration)
+        self._emit("iteration", iteration_dict(iteration))
+
+    def finish(self):
+        """Streams the totals once the search has returned."""
+        self._emit("search", self.to_dict())
+
+    def to_dict(self):
+        """Returns the counters, derived rates and iterations as plain JSON types."""
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name not in ("stream", "iterations")}
+        data["nps"] = self.nps
+        data["first_move_cutoff_rate"] = self.first_move_cutoff_rate
+        data["tt_hit_rate"] = self.tt_hit_rate
+        data["iterations"] = [iteration_dict(iteration) for iteration in self.iterations]
+        return data
+
+    def _emit(self, kind, data):
+        if self.stream is not None:
+            self.stream.write(json.dumps(dict(type=kind, **data)) + "\n")
+            self.stream.flush()
+
+def iteration_dict(iteration):
+    return {f.name: getattr(iteration, f.name) for f in fields(iteration)}
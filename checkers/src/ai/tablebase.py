@@ -0,0 +1,368 @@
+import argparse
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from itertools import combinations
+from math import comb
+from ..game.bitboard import (BitBoard, FULL_MASK, NEIGHBORS, KING_DIRECTIONS, RED_MAN_DIRECTIONS, BLACK_MAN_DIRECTIONS,
+                             can_capture, get_all_moves, iter_squares, move_count, popcount)
+from ..game.pieces import RED_PIECE, BLACK_PIECE
+
+# One file per material signature, named after its piece counts. Each holds
+# MAGIC and then a little-endian int16 per index: 0 for a draw, d > 0 when the
+# side to move wins in d plies, -(d + 1) when it loses in d plies.
+MAGIC = b"CKTB0002"
+VALUE = struct.Struct("<h")
+TB_WIN = 1000.0  # Search score of a win; a ply is taken off per move to the end
+
+# Red men never stand on row 0 and black men never on row 7: they would be kings
+RED_MAN_SQUARES = tuple(range(4, 32))
+BLACK_MAN_SQUARES = tuple(range(0, 28))
+ALL_SQUARES = tuple(range(32))
+RED_MAN_MASK = sum(1 << sq for sq in RED_MAN_SQUARES)
+BLACK_MAN_MASK = sum(1 << sq for sq in BLACK_MAN_SQUARES)
+# Men one step from crowning
+RED_CROWNING = 0x000000F0
+BLACK_CROWNING = 0x0F000000
+
+WIN, LOSS = 1, -1
+
+def signature_of(red, black, kings):
+    """Returns the material signature (red men, red kings, black men, black kings)."""
+    return (popcount(red & ~kings), popcount(red & kings), popcount(black & ~kings), popcount(black & kings))
+
+def signature_name(signature):
+    return "".join(str(count) for count in signature) + ".tb"
+
+_radices_by_signature = {}
+
+def _radices(signature):
+    """
+    Returns how many ways there are to place red men, black men, red kings and
+    black kings, in that order, once the groups before them are placed. Black
+    men share 24 of their squares with red men, and at most four red men can
+    stand on row 7 instead, so the black men count is a bound.
+    """
+    radices = _radices_by_signature.get(signature)
+    if radices is None:
+        red_men, red_kings, black_men, black_kings = signature
+        free = 32 - red_men - black_men
+        radices = (comb(28, red_men), comb(28 - max(0, red_men - 4), black_men),
+                   comb(free, red_kings), comb(free - red_kings, black_kings))
+        _radices_by_signature[signature] = radices
+    return radices
+
+def table_size(signature):
+    """Each piece group is ranked over the squares still free to it, times two sides to move."""
+    size = 2
+    for radix in _radices(signature):
+        size *= radix
+    return size
+
+def _rank(mask, free):
+    """Colex rank of the squares in mask among the sets of the same size drawn from free."""
+    rank = 0
+    i = 1
+    while mask:
+        low = mask & -mask
+        rank += comb(popcount(free & (low - 1)), i)
+        i += 1
+        mask ^= low
+    return rank
+
+def _unrank(rank, count, free):
+    """Returns the mask of count squares drawn from free whose _rank is rank."""
+    mask = 0
+    for i in range(count, 0, -1):
+        place = i - 1
+        while comb(place + 1, i) <= rank:
+            place += 1
+        rank -= comb(place, i)
+        # The square of the place-th set bit of free
+        bits = free
+        for _ in range(place):
+            bits &= bits - 1
+        mask |= bits & -bits
+    return mask
+
+def table_index(signature, red, black, kings, player):
+    red_men = red & ~kings
+    black_men = black & ~kings
+    free = FULL_MASK & ~(red_men | black_men)
+    ranks = (_rank(red_men, RED_MAN_MASK), _rank(black_men, BLACK_MAN_MASK & ~red_men),
+             _rank(red & kings, free), _rank(black & kings, free & ~red))
+    index = 0
+    for radix, rank in zip(_radices(signature), ranks):
+        index = index * radix + rank
+    return index * 2 + (player == BLACK_PIECE)
+
+def table_position(signature, index):
+    """Returns the (red, black, kings, player) that table_index maps to index."""
+    player = BLACK_PIECE if index & 1 else RED_PIECE
+    index >>= 1
+    ranks = []
+    for radix in reversed(_radices(signature)):
+        index, rank = divmod(index, radix)
+        ranks.append(rank)
+    red_men_rank, black_men_rank, red_kings_rank, black_kings_rank = reversed(ranks)
+    red_men, red_kings, black_men, black_kings = signature
+    red = _unrank(red_men_rank, red_men, RED_MAN_MASK)
+    black = _unrank(black_men_rank, black_men, BLACK_MAN_MASK & ~red)
+    free = FULL_MASK & ~(red | black)
+    kings = _unrank(red_kings_rank, red_kings, free)
+    red |= kings
+    black_king_mask = _unrank(black_kings_rank, black_kings, free & ~kings)
+    return red, black | black_king_mask, kings | black_king_mask, player
+
+def signatures(max_pieces):
+    """Yields every signature with both sides on the board, in an order where each one's successors come first."""
+    found = []
+    for total in range(2, max_pieces + 1):
+        for red_men in range(total):
+            for red_kings in range(total - red_men):
+                for black_men in range(total - red_men - red_kings + 1):
+                    black_kings = total - red_men - red_kings - black_men
+                    if red_men + red_kings and black_men + black_kings:
+                        found.append((red_men, red_kings, black_men, black_kings))
+    # Captures lower the piece count and promotions the man count
+    return sorted(found, key=lambda s: (sum(s), s[0] + s[2]))
+
+def _placements(signature):
+    """Yields (red, black, kings) for every way to place the signature's pieces."""
+    red_men, red_kings, black_men, black_kings = signature
+
+    def choose(squares, count, used):
+        for chosen in combinations([sq for sq in squares if not used >> sq & 1], count):
+            mask = 0
+            for sq in chosen:
+                mask |= 1 << sq
+            yield mask
+
+    for rm in choose(RED_MAN_SQUARES, red_men, 0):
+        for rk in choose(ALL_SQUARES, red_kings, rm):
+            for bm in choose(BLACK_MAN_SQUARES, black_men, rm | rk):
+                for bk in choose(ALL_SQUARES, black_kings, rm | rk | bm):
+                    yield rm | rk, bm | bk, rk | bk
+
+def _parents(signature, index):
+    """
+    Yields the indices of the positions one quiet move before index: the side that
+    just moved takes back a step that stayed in the signature, from a position
+    where it had no capture and so was allowed to make it.
+    """
+    red, black, kings, player = table_position(signature, index)
+    mover = BLACK_PIECE if player == RED_PIECE else RED_PIECE
+    own = red if mover == RED_PIECE else black
+    man_directions = RED_MAN_DIRECTIONS if mover == RED_PIECE else BLACK_MAN_DIRECTIONS
+    occupied = red | black
+    for sq in iter_squares(own):
+        king = kings >> sq & 1
+        for d in KING_DIRECTIONS if king else man_directions:
+            # The square a piece moving in direction d came from
+            origin = NEIGHBORS[sq][3 - d]
+            if origin is None or occupied >> origin & 1:
+                continue
+            back = 1 << sq | 1 << origin
+            parent = BitBoard(red ^ back if mover == RED_PIECE else red, black ^ back if mover == BLACK_PIECE else black,
+                              kings ^ back if king else kings, key=0, material=0)
+            if not can_capture(parent, mover):
+                yield table_index(signature, parent.red, parent.black, parent.kings, mover)
+
+def solve_signature(signature, solved):
+    """
+    Retrograde analysis of one signature. A pass over every position counts its
+    moves and settles the ones decided by having no moves or by leaving the
+    signature; results then spread back one ply distance at a time, finding
+    each position's predecessors by taking back quiet moves. solved maps the
+    signatures reachable by captures and promotions to their finished tables.
+    Returns the table as an array of int16 values.
+    """
+    size = table_size(signature)
+    values = array('h', bytes(2 * size))
+    remaining = array('B', bytes(size))  # Moves not yet known to lose for the side making them
+    longest = array('h', bytes(2 * size))  # Longest distance among the opponent wins found so far
+    buckets = []  # Per distance, index * 2 + 1 for a win and index * 2 for a loss
+
+    def push(distance, index, kind):
+        while len(buckets) <= distance:
+            buckets.append(array('q'))
+        buckets[distance].append(index * 2 + (kind == WIN))
+
+    for red, black, kings in _placements(signature):
+        for player in (RED_PIECE, BLACK_PIECE):
+            position = BitBoard(red, black, kings, key=0, material=0)
+            index = table_index(signature, red, black, kings, player)
+            men = (red & RED_CROWNING if player == RED_PIECE else black & BLACK_CROWNING) & ~kings
+            if not men and not can_capture(position, player):
+                # Every move is a step that stays in the signature
+                count = move_count(position, player)
+                if count:
+                    remaining[index] = count
+                else:
+                    push(0, index, LOSS)
+                continue
+            moves = get_all_moves(position, player)
+            if not moves:
+                push(0, index, LOSS)
+                continue
+            opponent = BLACK_PIECE if player == RED_PIECE else RED_PIECE
+            count = len(moves)
+            worst = 0
+            win = None
+            for move in moves:
+                undo = position.make_move(move)
+                after = signature_of(position.red, position.black, position.kings)
+                if after == signature:
+                    pass  # Settled when the successor is, through _parents
+                elif not (after[0] + after[1] and after[2] + after[3]):
+                    win = 1  # Took the last piece
+                else:
+                    value = solved[after][table_index(after, position.red, position.black, position.kings, opponent)]
+                    if value < 0 and (win is None or -value < win):
+                        win = -value  # Opponent loses in -value - 1 plies
+                    elif value > 0:
+                        count -= 1
+                        worst = max(worst, value)
+                position.unmake_move(undo)
+            remaining[index] = count
+            longest[index] = worst
+            if win is not None:
+                push(win, index, WIN)
+            elif count == 0:
+                push(worst + 1, index, LOSS)
+
+    distance = 0
+    while distance < len(buckets):
+        for entry in buckets[distance]:
+            index = entry >> 1
+            if values[index]:
+                continue  # Already decided at a shorter distance
+            won = entry & 1
+            values[index] = distance if won else -(distance + 1)
+            for parent in _parents(signature, index):
+                if values[parent]:
+                    continue
+                if not won:
+                    push(distance + 1, parent, WIN)
+                else:
+                    remaining[parent] -= 1
+                    longest[parent] = max(longest[parent], distance)
+                    if remaining[parent] == 0:
+                        push(longest[parent] + 1, parent, LOSS)
+        buckets[distance] = None
+        distance += 1
+    return values
+
+def build_tablebases(directory, max_pieces=6):
+    """
+    Solves every signature with up to max_pieces pieces and writes one file
+    per signature to directory. A multi-jump is one ply, as in the search.
+    Returns the number of files written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    solved = {}
+    maps = []
+    try:
+        for signature in signatures(max_pieces):
+            start = time.perf_counter()
+            values = solve_signature(signature, solved)
+            path = os.path.join(directory, signature_name(signature))
+            data = values
+            if sys.byteorder != "little":
+                data = array('h', values)
+                data.byteswap()
+            with open(path, "wb") as f:
+                f.write(MAGIC)
+                data.tofile(f)
+            if sys.byteorder == "little":
+                # Later signatures read this one through the page cache instead of holding every table
+                with open(path, "rb") as f:
+                    table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                maps.append(table)
+                values = memoryview(table)[len(MAGIC):].cast('h')
+            solved[signature] = values
+            logging.info(f"Tablebase {signature_name(signature)}: {time.perf_counter() - start:.1f}s")
+    finally:
+        for values in solved.values():
+            if isinstance(values, memoryview):
+                values.release()
+        for table in maps:
+            table.close()
+    return len(solved)
+
+class Tablebase:
+    """Endgame tables in directory, each mapped into memory the first time it is probed."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._maps = {}
+        self.max_pieces = 0
+        for name in os.listdir(directory):
+            if name.endswith(".tb") and len(name) == 7 and name[:4].isdigit():
+                self.max_pieces = max(self.max_pieces, sum(int(digit) for digit in name[:4]))
+
+    @classmethod
+    def open_if_exists(cls, directory):
+        """Returns the tables in directory, or None when there are none."""
+        if not directory or not os.path.isdir(directory):
+            return None
+        tablebase = cls(directory)
+        return tablebase if tablebase.max_pieces else None
+
+    def _table(self, signature):
+        if signature not in self._maps:
+            table = None
+            path = os.path.join(self.directory, signature_name(signature))
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if table[:len(MAGIC)] != MAGIC or len(table) != len(MAGIC) + 2 * table_size(signature):
+                    logging.warning(f"Ignoring damaged tablebase {path}")
+                    table.close()
+                    table = None
+            self._maps[signature] = table
+        return self._maps[signature]
+
+    def probe(self, position, player):
+        """
+        Returns the stored value for position with player to move, or None when
+        it has too many pieces or its table is missing.
+        """
+        if popcount(position.red | position.black) > self.max_pieces:
+            return None
+        signature = signature_of(position.red, position.black, position.kings)
+        if not (signature[0] + signature[1] and signature[2] + signature[3]):
+            return None
+        table = self._table(signature)
+        if table is None:
+            return None
+        index = table_index(signature, position.red, position.black, position.kings, player)
+        return VALUE.unpack_from(table, len(MAGIC) + 2 * index)[0]
+
+    def close(self):
+        for table in self._maps.values():
+            if table is not None:
+                table.close()
+        self._maps.clear()
+
+def tablebase_score(value):
+    """Turns a stored value into a search score for the side to move, larger for quicker wins."""
+    if value == 0:
+        return 0.0
+    return TB_WIN - value if value > 0 else -(TB_WIN - (-value - 1))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build endgame tablebases by retrograde analysis")
+    parser.add_argument("directory")
+    parser.add_argument("--pieces", type=int, default=6, help="largest number of pieces on the board")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    count = build_tablebases(args.directory, args.pieces)
+    print(f"Wrote {count} tables to {args.directory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import struct
+from array import array
+from multiprocessing import shared_memory
+from ..game.move import encode_move, move_ends, MOVE_MASK, NO_MOVE
+
+# Bound types stored with each score
+EXACT = 0
+LOWER = 1  # Score is a lower bound (the search failed high)
+UPPER = 2  # Score is an upper bound (the search failed low)
+
+EMPTY_DEPTH = -1
+
+# Each bucket holds a depth-preferred slot followed by an always-replace slot
+BUCKET_SLOTS = 2
+# key (8) + score (8) + depth, bound, age (1 each) + move (2)
+ENTRY_BYTES = 21
+
+# Tables hold scores from the side to move's point of view, so an entry serves
+# searches for either root player. The search scores from its root player's
+# point of view; at nodes where the opponent moves the score is negated and
+# the bound turns around.
+OPPOSITE_BOUND = (EXACT, UPPER, LOWER)
+
+def side_relative(score, bound, maximizing):
+    """Converts a score and bound between the root player's and the side to move's point of view, either way."""
+    if maximizing:
+        return score, bound
+    return -score, OPPOSITE_BOUND[bound]
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results sized in megabytes.
+    Entries live in parallel typed arrays so memory use is bounded up front.
+    """
+
+    def __init__(self, size_mb=16):
+        entries = max(BUCKET_SLOTS, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        buckets = 1 << ((entries // BUCKET_SLOTS).bit_length() - 1)
+        self.size_mb = size_mb
+        self.slots = buckets * BUCKET_SLOTS
+        self._bucket_mask = buckets - 1
+        self.clear()
+
+    def clear(self):
+        """Empties the table."""
+        self._keys = array('Q', bytes(8 * self.slots))
+        self._scores = array('d', bytes(8 * self.slots))
+        self._depths = array('b', [EMPTY_DEPTH]) * self.slots
+        self._bounds = array('B', bytes(self.slots))
+        self._ages = array('B', bytes(self.slots))
+        self._moves = array('H', [NO_MOVE]) * self.slots
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        """Marks existing entries as stale so the next search can replace them first."""
+        self.age = (self.age + 1) & 0xFF
+
+    def probe(self, key):
+        """
+        Returns (depth, score, bound, move) stored for key, or None. The move is
+        kept as its (start, end) only, which two multi-jumps by different paths
+        can share; it orders the search, and callers that play it must check it
+        names a single generated move.
+        """
+        self.probes += 1
+        slot = (key & self._bucket_mask) * BUCKET_SLOTS
+        for i in (slot, slot + 1):
+            if self._keys[i] == key and self._depths[i] != EMPTY_DEPTH:
+                self.hits += 1
+                move = self._moves[i]
+                return (self._depths[i], self._scores[i], self._bounds[i],
+                        None if move == NO_MOVE else move_ends(move))
+        return None
+
+    def store(self, key, depth, score, bound, move=None):
+        """
+        Stores a search result. The first slot of a bucket keeps the deepest
+        current entry; anything that does not qualify goes to the second slot.
+        """
+        slot = (key & self._bucket_mask) * BUCKET_SLOTS
+        stored_depth = self._depths[slot]
+        if (stored_depth == EMPTY_DEPTH or self._keys[slot] == key
+                or depth >= stored_depth or self._ages[slot] != self.age):
+            i = slot
+        else:
+            i = slot + 1
+        if move is None and self._keys[i] == key:
+            # Keep the best move from an earlier search of the same position
+            code = self._moves[i]
+        else:
+            code = NO_MOVE if move is None else encode_move(move) & MOVE_MASK
+        self._keys[i] = key
+        self._scores[i] = score
+        self._depths[i] = min(depth, 127)
+        self._bounds[i] = bound
+        self._ages[i] = self.age
+        self._moves[i] = code
+
+    def usage(self):
+        """Returns the fraction of slots written during the current search."""
+        used = sum(1 for i in range(self.slots)
+                   if self._depths[i] != EMPTY_DEPTH and self._ages[i] == self.age)
+        return used / self.slots
+
+# Shared table layout: a header of two words (stop flag, age) followed by three
+# words per slot: check, score and meta. check is key ^ score bits ^ meta, so a
+# slot torn by two processes writing at once fails verification instead of
+# returning another position's result.
+HEADER_WORDS = 2
+SLOT_WORDS = 3
+SHARED_ENTRY_BYTES = 8 * SLOT_WORDS
+
+_DOUBLE = struct.Struct('<d')
+_WORD = struct.Struct('<Q')
+
+def _score_bits(score):
+    return _WORD.unpack(_DOUBLE.pack(score))[0]
+
+class SharedFlag:
+    """A flag in a shared table header; has the is_set() SearchContext checks for stop."""
+
+    def __init__(self, words, index):
+        self._words = words
+        self._index = index
+
+    def is_set(self):
+        return self._words[self._index] != 0
+
+    def set(self):
+        self._words[self._index] = 1
+
+    def clear(self):
+        self._words[self._index] = 0
+
+class SharedTranspositionTable:
+    """
+    Transposition table in a multiprocessing.shared_memory block so several search
+    processes can read and write it without locks. Uses the same bucket and
+    replacement scheme as TranspositionTable. Create it in one process and
+    attach to it by name in the others.
+    """
+
+    def __init__(self, size_mb=16, name=None):
+        if name is None:
+            entries = max(BUCKET_SLOTS, int(size_mb * 1024 * 1024) // SHARED_ENTRY_BYTES)
+            buckets = 1 << ((entries // BUCKET_SLOTS).bit_length() - 1)
+            size = 8 * (HEADER_WORDS + buckets * BUCKET_SLOTS * SLOT_WORDS)
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.size_mb = size_mb
+        self.name = self._shm.name
+        # Attaching registers the block again with the resource tracker, which pool
+        # workers share with the creating process; the creator's unlink releases both
+        self._words = self._shm.buf.cast('Q')
+        self._scores = self._shm.buf.cast('d')
+        # The block may be rounded up to a page; only whole buckets are used
+        buckets = 1 << (((len(self._words) - HEADER_WORDS) // (BUCKET_SLOTS * SLOT_WORDS)).bit_length() - 1)
+        self.slots = buckets * BUCKET_SLOTS
+        self._bucket_mask = buckets - 1
+        self.stop = SharedFlag(self._words, 0)
+        self.probes = 0
+        self.hits = 0
+
+    @classmethod
+    def attach(cls, name):
+        """Opens a table created by another process."""
+        return cls(name=name)
+
+    @property
+    def age(self):
+        return self._words[1]
+
+    def clear(self):
+        """Empties the table and resets the stop flag and age."""
+        self._shm.buf[:] = bytes(len(self._shm.buf))
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        """Marks existing entries as stale so the next search can replace them first."""
+        self._words[1] = (self._words[1] + 1) & 0xFF
+
+    def _read(self, i):
+        """Returns (key, score, meta) of slot i; key is garbage if the slot was torn."""
+        base = HEADER_WORDS + i * SLOT_WORDS
+        check, meta = self._words[base], self._words[base + 2]
+        score = self._scores[base + 1]
+        return check ^ _score_bits(score) ^ meta, score, meta
+
+    def probe(self, key):
+        """Returns (depth, score, bound, move) stored for key, or None; see TranspositionTable.probe."""
+        self.probes += 1
+        slot = (key & self._bucket_mask) * BUCKET_SLOTS
+        for i in (slot, slot + 1):
+            stored_key, score, meta = self._read(i)
+            if stored_key == key and meta & 0xFF:
+                self.hits += 1
+                move = meta >> 24 & 0xFFFF
+                return ((meta & 0xFF) - 1, score, meta >> 8 & 0xFF,
+                        None if move == NO_MOVE else move_ends(move))
+        return None
+
+    def store(self, key, depth, score, bound, move=None):
+        """Stores a search result; see TranspositionTable.store."""
+        slot = (key & self._bucket_mask) * BUCKET_SLOTS
+        age = self.age
+        stored_key, _, meta = self._read(slot)
+        stored_depth = (meta & 0xFF) - 1
+        if (stored_depth == EMPTY_DEPTH or stored_key == key
+                or depth >= stored_depth or meta >> 16 & 0xFF != age):
+            i = slot
+        else:
+            i = slot + 1
+            stored_key, _, meta = self._read(i)
+        if move is None and stored_key == key:
+            code = meta >> 24 & 0xFFFF
+        else:
+            code = NO_MOVE if move is None else encode_move(move) & MOVE_MASK
+        meta = (min(depth, 126) + 1) | bound << 8 | age << 16 | code << 24
+        base = HEADER_WORDS + i * SLOT_WORDS
+        self._words[base] = key ^ _score_bits(score) ^ meta
+        self._scores[base + 1] = score
+        self._words[base + 2] = meta
+
+    def usage(self):
+        """Returns the fraction of slots written during the current search."""
+        age = self.age
+        used = 0
+        for i in range(self.slots):
+            meta = self._words[HEADER_WORDS + i * SLOT_WORDS + 2]
+            if meta & 0xFF and meta >> 16 & 0xFF == age:
+                used += 1
+        return used / self.slots
+
+    def close(self):
+        """Detaches from the block, removing it if this process created it."""
+        self._words.release()
+        self._scores.release()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
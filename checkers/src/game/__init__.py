@@ -1,4 +1,12 @@
-from .checkers_game import CheckersGame
 from .board import initialize_board, apply_move
+from .bitboard import BitBoard
 from .pieces import *
-from .move_generator import get_possible_moves
\ No newline at end of file
+from .move_generator import get_possible_moves
+
+def __getattr__(name):
+    # The game window pulls in pygame, logging and the AI, which imports this package;
+    # load it only when asked for so the rules can be imported on their own
+    if name == "CheckersGame":
+        from .checkers_game import CheckersGame
+        return CheckersGame
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
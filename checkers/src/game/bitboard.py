@@ -0,0 +1,479 @@
+import logging
+from .pieces import *
+from .move import Move
+from .zobrist import PIECE_KEYS, SIDE_KEY, position_key
+
+# Playable squares are numbered 0-31 in row-major order: square = row * 4 + col // 2.
+# A position is three 32-bit masks over those squares: red, black and kings.
+SQUARES = tuple((sq // 4, 2 * (sq % 4) + (1 - (sq // 4) % 2)) for sq in range(32))
+# Boards whose pieces all sit on light squares are stored mirrored (col -> 7 - col)
+MIRRORED_SQUARES = tuple((row, 7 - col) for row, col in SQUARES)
+SQUARE_INDEX = {rc: sq for sq, rc in enumerate(SQUARES)}
+MIRRORED_SQUARE_INDEX = {rc: sq for sq, rc in enumerate(MIRRORED_SQUARES)}
+
+FULL_MASK = 0xFFFFFFFF
+ROW_0 = 0x0000000F  # Red promotes here
+ROW_7 = 0xF0000000  # Black promotes here
+
+# Material in half points so it stays an exact integer: a man is 1, a king 1.5
+MAN_HALVES = 2
+KING_HALVES = 3
+
+# Directions in the order the list generator tries them: up-left, up-right, down-left, down-right
+DIRECTIONS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+RED_MAN_DIRECTIONS = (0, 1)
+BLACK_MAN_DIRECTIONS = (2, 3)
+KING_DIRECTIONS = (0, 1, 2, 3)
+
+
+def _build_tables():
+    """Builds per-direction shift masks and per-square neighbour/jump tables."""
+    steps = []
+    neighbors = [[None] * 4 for _ in range(32)]
+    jumps = [[None] * 4 for _ in range(32)]
+    for d, (dr, dc) in enumerate(DIRECTIONS):
+        by_offset = {}
+        for sq, (row, col) in enumerate(SQUARES):
+            step = SQUARE_INDEX.get((row + dr, col + dc))
+            if step is None:
+                continue
+            neighbors[sq][d] = step
+            by_offset[step - sq] = by_offset.get(step - sq, 0) | (1 << sq)
+            land = SQUARE_INDEX.get((row + 2 * dr, col + 2 * dc))
+            if land is not None:
+                jumps[sq][d] = (step, land)
+        steps.append(tuple(sorted(by_offset.items())))
+    return tuple(steps), tuple(map(tuple, neighbors)), tuple(map(tuple, jumps))
+
+
+# _STEPS[d] holds (offset, source mask) pairs: a piece on an even row and one on an
+# odd row move by different offsets in the same direction.
+_STEPS, NEIGHBORS, JUMPS = _build_tables()
+
+
+def _stepper(d):
+    """
+    Returns a function that moves every bit of a mask one square in direction d,
+    dropping pieces that fall off the board. Both offsets of a direction have
+    the same sign, so each shift is fixed.
+    """
+    (off_a, mask_a), (off_b, mask_b) = _STEPS[d]
+    if off_a < 0:
+        right_a, right_b = -off_a, -off_b
+        return lambda bits: (bits & mask_a) >> right_a | (bits & mask_b) >> right_b
+    return lambda bits: (bits & mask_a) << off_a | (bits & mask_b) << off_b
+
+
+_UP_LEFT, _UP_RIGHT, _DOWN_LEFT, _DOWN_RIGHT = (_stepper(d) for d in KING_DIRECTIONS)
+
+
+def popcount(bits):
+    """Returns the number of set bits in the mask."""
+    return bin(bits).count("1")
+
+
+def material_halves(red, black, kings):
+    """Returns red minus black material, in half points."""
+    men = ~kings
+    return (MAN_HALVES * (popcount(red & men) - popcount(black & men))
+            + KING_HALVES * (popcount(red & kings) - popcount(black & kings)))
+
+
+def iter_squares(bits):
+    """Yields the square numbers of the set bits in ascending order."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class BitBoard:
+    """Checkers position packed into red, black and king masks over the 32 playable squares."""
+    __slots__ = ("red", "black", "kings", "mirrored", "key", "material")
+
+    def __init__(self, red=0, black=0, kings=0, mirrored=False, key=None, player=RED_PIECE, material=None):
+        self.red = red
+        self.black = black
+        self.kings = kings
+        self.mirrored = mirrored
+        # Zobrist key of the position and side to move, kept up to date by every move
+        self.key = position_key(red, black, kings, player == BLACK_PIECE) if key is None else key
+        # Red minus black material in half points, kept up to date by every move
+        self.material = material_halves(red, black, kings) if material is None else material
+
+    @classmethod
+    def from_board(cls, board, player=RED_PIECE):
+        """Builds a bitboard from an 8x8 list-of-lists board with player to move."""
+        dark = []
+        light = []
+        for row in range(8):
+            for col in range(8):
+                piece = board[row][col]
+                if piece != EMPTY:
+                    (dark if (row + col) % 2 == 1 else light).append((row, col, piece))
+        if dark and light:
+            raise ValueError("Board has pieces on both light and dark squares")
+        mirrored = bool(light)
+        index = MIRRORED_SQUARE_INDEX if mirrored else SQUARE_INDEX
+        red = black = kings = 0
+        for row, col, piece in dark or light:
+            bit = 1 << index[(row, col)]
+            if piece.lower() == RED_PIECE:
+                red |= bit
+            else:
+                black |= bit
+            if piece.isupper():
+                kings |= bit
+        return cls(red, black, kings, mirrored, player=player)
+
+    def to_board(self):
+        """Returns the position as an 8x8 list-of-lists board."""
+        board = [[EMPTY for _ in range(8)] for _ in range(8)]
+        coords = self.coordinates()
+        for sq in iter_squares(self.red | self.black):
+            row, col = coords[sq]
+            board[row][col] = self.piece_at(sq)
+        return board
+
+    def copy(self):
+        return BitBoard(self.red, self.black, self.kings, self.mirrored, self.key, material=self.material)
+
+    def coordinates(self):
+        """Returns the square -> (row, col) table for this board's orientation."""
+        return MIRRORED_SQUARES if self.mirrored else SQUARES
+
+    def square_at(self, row, col):
+        """Returns the square number for (row, col), or None for an unplayable square."""
+        return (MIRRORED_SQUARE_INDEX if self.mirrored else SQUARE_INDEX).get((row, col))
+
+    def piece_at(self, sq):
+        """Returns the piece character on a square."""
+        bit = 1 << sq
+        if self.red & bit:
+            return RED_KING if self.kings & bit else RED_PIECE
+        if self.black & bit:
+            return BLACK_KING if self.kings & bit else BLACK_PIECE
+        return EMPTY
+
+    def make_move(self, move):
+        """
+        Plays a move on this position in place, handling captures and king promotion,
+        and hands the turn to the opponent. A Move takes every piece it jumps; a
+        plain tuple is a single step or jump. Returns an undo token for unmake_move.
+        """
+        (sr, sc), (er, ec) = move
+        start = self.square_at(sr, sc)
+        end = self.square_at(er, ec)
+        if start is None or end is None:
+            raise ValueError(f"Move {move} is off the playable squares")
+        from_bit = 1 << start
+        to_bit = 1 << end
+        red = bool(self.red & from_bit)
+        if not red and not self.black & from_bit:
+            raise ValueError(f"No piece at ({sr}, {sc})")
+
+        # A king's multi-jump may end where it started
+        moved = from_bit ^ to_bit
+        kind = 0 if red else 2
+        # Every king change is recorded as an XOR so unmake_move can replay it
+        gain = 0  # Material the mover gains, in half points
+        if self.kings & from_bit:
+            king_flips = moved
+            key = PIECE_KEYS[kind + 1][start] ^ PIECE_KEYS[kind + 1][end]
+        elif to_bit & (ROW_0 if red else ROW_7):
+            king_flips = to_bit
+            key = PIECE_KEYS[kind][start] ^ PIECE_KEYS[kind + 1][end]
+            gain = KING_HALVES - MAN_HALVES
+        else:
+            king_flips = 0
+            key = PIECE_KEYS[kind][start] ^ PIECE_KEYS[kind][end]
+        key ^= SIDE_KEY
+        if isinstance(move, Move):
+            captured = move.captured
+        elif abs(er - sr) == 2:
+            captured = 1 << self.square_at((sr + er) // 2, (sc + ec) // 2)
+        else:
+            captured = 0
+        if captured:
+            captured_kings = self.kings & captured
+            king_flips |= captured_kings
+            for sq in iter_squares(captured):
+                key ^= PIECE_KEYS[(2 - kind) + (captured_kings >> sq & 1)][sq]
+            gain += KING_HALVES * popcount(captured_kings) + MAN_HALVES * popcount(captured & ~captured_kings)
+
+        if red:
+            self.red ^= moved
+            self.black ^= captured
+        else:
+            self.black ^= moved
+            self.red ^= captured
+        self.kings ^= king_flips
+        self.key ^= key
+        material = gain if red else -gain
+        self.material += material
+        return (red, moved, captured, king_flips, key, material)
+
+    def unmake_move(self, undo):
+        """Takes back a move played with make_move, restoring captures and promotions."""
+        red, moved, captured, king_flips, key, material = undo
+        if red:
+            self.red ^= moved
+            self.black ^= captured
+        else:
+            self.black ^= moved
+            self.red ^= captured
+        self.kings ^= king_flips
+        self.key ^= key
+        self.material -= material
+
+    def __eq__(self, other):
+        if not isinstance(other, BitBoard):
+            return NotImplemented
+        return (self.red, self.black, self.kings, self.mirrored) == \
+               (other.red, other.black, other.kings, other.mirrored)
+
+    def __hash__(self):
+        return hash((self.red, self.black, self.kings, self.mirrored))
+
+    def __repr__(self):
+        return f"BitBoard(red={self.red:#010x}, black={self.black:#010x}, kings={self.kings:#010x})"
+
+
+def _sides(pos, player):
+    """Returns (own, opponent) masks for the given player."""
+    if player == RED_PIECE:
+        return pos.red, pos.black
+    return pos.black, pos.red
+
+
+def _build_move_tables(coords):
+    """
+    Builds the moves that need no search for one board orientation, as
+    (steps, jumps): steps[king][sq][dirs] is the tuple of steps from sq in the
+    directions set in the 4-bit dirs, and jumps[king][sq][d] the single jump in
+    direction d. A man is crowned on row 0 moving up and on row 7 moving down.
+    """
+    crowns = (ROW_0, ROW_0, ROW_7, ROW_7)
+
+    def move(king, sq, d, land, captured):
+        return Move((coords[sq], coords[land]), captured, not king and bool(crowns[d] >> land & 1))
+
+    steps = ([], [])
+    jumps = ([], [])
+    for king in (0, 1):
+        for sq in range(32):
+            by_direction = [None if NEIGHBORS[sq][d] is None else move(king, sq, d, NEIGHBORS[sq][d], 0)
+                            for d in KING_DIRECTIONS]
+            steps[king].append(tuple(tuple(by_direction[d] for d in KING_DIRECTIONS
+                                           if dirs >> d & 1 and by_direction[d] is not None)
+                                     for dirs in range(16)))
+            jumps[king].append(tuple(None if JUMPS[sq][d] is None
+                                     else move(king, sq, d, JUMPS[sq][d][1], 1 << JUMPS[sq][d][0])
+                                     for d in KING_DIRECTIONS))
+    return tuple(map(tuple, steps)), tuple(map(tuple, jumps))
+
+
+# Moves are immutable, so every generator call hands out these shared objects,
+# indexed by BitBoard.mirrored; only multi-jumps are built as they are found
+_STEP_MOVES, _JUMP_MOVES = zip(_build_move_tables(SQUARES), _build_move_tables(MIRRORED_SQUARES))
+
+
+def _movers(pos, player):
+    """Returns (own, pieces that may move up, pieces that may move down) for player."""
+    if player == RED_PIECE:
+        return pos.red, pos.red, pos.red & pos.kings
+    return pos.black, pos.black & pos.kings, pos.black
+
+
+def jump_sources(pos, player):
+    """Returns, per direction, the mask of squares whose piece can jump in that direction."""
+    own, up, down = _movers(pos, player)
+    opp = (pos.red | pos.black) ^ own
+    empty = ~(pos.red | pos.black) & FULL_MASK
+    # Walk back from the empty landing squares, over an opponent piece, onto the jumpers
+    sources = [0, 0, 0, 0]
+    if up:
+        sources[0] = _DOWN_RIGHT(_DOWN_RIGHT(empty) & opp) & up
+        sources[1] = _DOWN_LEFT(_DOWN_LEFT(empty) & opp) & up
+    if down:
+        sources[2] = _UP_RIGHT(_UP_RIGHT(empty) & opp) & down
+        sources[3] = _UP_LEFT(_UP_LEFT(empty) & opp) & down
+    return sources
+
+
+def can_capture(pos, player):
+    """Returns True when player has a jump available anywhere on the board."""
+    jumps = jump_sources(pos, player)
+    return bool(jumps[0] | jumps[1] | jumps[2] | jumps[3])
+
+
+def step_sources(pos, player):
+    """Returns, per direction, the mask of squares whose piece can step in that direction."""
+    _, up, down = _movers(pos, player)
+    empty = ~(pos.red | pos.black) & FULL_MASK
+    # Step back from the empty squares onto the movers that could reach them
+    sources = [0, 0, 0, 0]
+    if up:
+        sources[0] = _DOWN_RIGHT(empty) & up
+        sources[1] = _DOWN_LEFT(empty) & up
+    if down:
+        sources[2] = _UP_RIGHT(empty) & down
+        sources[3] = _UP_LEFT(empty) & down
+    return sources
+
+
+def _can_jump(sq, directions, opp, empty):
+    for d in directions:
+        jump = JUMPS[sq][d]
+        if jump and opp >> jump[0] & 1 and empty >> jump[1] & 1:
+            return True
+    return False
+
+
+def _add_jumps(moves, pos, player, sq, first):
+    """
+    Appends every complete jump sequence of the piece on sq, depth first in direction
+    order. first is jump_sources for player; a first jump that cannot go on is
+    answered from the table of single jumps.
+    """
+    opp = pos.black if player == RED_PIECE else pos.red
+    king = pos.kings >> sq & 1
+    empty = ~(pos.red | pos.black) & FULL_MASK | 1 << sq
+    if king:
+        directions = KING_DIRECTIONS
+    else:
+        directions = RED_MAN_DIRECTIONS if player == RED_PIECE else BLACK_MAN_DIRECTIONS
+    single = _JUMP_MOVES[pos.mirrored][king][sq]
+    for d in directions:
+        if first[d] >> sq & 1:
+            over, land = JUMPS[sq][d]
+            # Jumped pieces leave the board at once, as in the list generator
+            bit = 1 << over
+            if _can_jump(land, directions, opp ^ bit, empty | bit):
+                crown = 0 if king else (ROW_0 if player == RED_PIECE else ROW_7)
+                _extend_jump(moves, pos.coordinates(), crown, directions, land, (sq, land),
+                             opp ^ bit, empty | bit, bit)
+            else:
+                moves.append(single[d])
+
+
+def _extend_jump(moves, coords, crown, directions, sq, path, opp, empty, captured):
+    """Follows a multi-jump over square numbers, converting its path to (row, col) once it ends."""
+    found = False
+    for d in directions:
+        jump = JUMPS[sq][d]
+        if jump and opp >> jump[0] & 1 and empty >> jump[1] & 1:
+            found = True
+            over = 1 << jump[0]
+            _extend_jump(moves, coords, crown, directions, jump[1], path + (jump[1],),
+                         opp ^ over, empty | over, captured | over)
+    if not found:
+        moves.append(Move(tuple(coords[s] for s in path), captured, bool(crown >> sq & 1)))
+
+
+def move_count(pos, player):
+    """
+    Returns the number of steps, or of first jumps when player can capture, without
+    building moves; len(get_all_moves) differs only where a jump can go on.
+    """
+    sources = jump_sources(pos, player)
+    if not (sources[0] | sources[1] | sources[2] | sources[3]):
+        sources = step_sources(pos, player)
+    # Each (square, direction) pair is one move; count all four masks in one go
+    return popcount(sources[0] | sources[1] << 32 | sources[2] << 64 | sources[3] << 96)
+
+
+def get_all_moves(pos, player, must_capture=True):
+    """
+    Returns all complete moves for player as Move objects, a multi-jump being
+    one move, in the same order as the list-board generator.
+    """
+    jumps = jump_sources(pos, player)
+    jumpers = jumps[0] | jumps[1] | jumps[2] | jumps[3]
+    moves = []
+    if jumpers and must_capture:
+        for sq in iter_squares(jumpers):
+            _add_jumps(moves, pos, player, sq, jumps)
+        return moves
+    up_left, up_right, down_left, down_right = step_sources(pos, player)
+    kings = pos.kings
+    steps = _STEP_MOVES[pos.mirrored]
+    # Without forced capture each piece lists its jumps before its steps
+    movers = jumpers | up_left | up_right | down_left | down_right
+    while movers:
+        low = movers & -movers
+        sq = low.bit_length() - 1
+        movers ^= low
+        if jumpers & low:
+            _add_jumps(moves, pos, player, sq, jumps)
+        dirs = (up_left >> sq & 1 | (up_right >> sq & 1) << 1
+                | (down_left >> sq & 1) << 2 | (down_right >> sq & 1) << 3)
+        moves += steps[kings >> sq & 1][sq][dirs]
+    return moves
+
+
+def _piece_directions(piece):
+    if piece in (RED_KING, BLACK_KING):
+        return KING_DIRECTIONS
+    return RED_MAN_DIRECTIONS if piece == RED_PIECE else BLACK_MAN_DIRECTIONS
+
+
+def get_capturing_moves_from(pos, row, col):
+    """Returns only the capturing moves available from (row, col)."""
+    sq = pos.square_at(row, col)
+    if sq is None:
+        return []
+    piece = pos.piece_at(sq)
+    if piece == EMPTY:
+        return []
+    _, opp = _sides(pos, piece.lower())
+    occupied = pos.red | pos.black
+    coords = pos.coordinates()
+    moves = []
+    for d in _piece_directions(piece):
+        jump = JUMPS[sq][d]
+        if jump and opp >> jump[0] & 1 and not occupied >> jump[1] & 1:
+            moves.append(((row, col), coords[jump[1]]))
+    return moves
+
+
+def get_possible_moves(pos, row, col, must_capture=True):
+    """Returns a list of legal moves for the piece at (row, col)."""
+    capture_moves = get_capturing_moves_from(pos, row, col)
+    if capture_moves and must_capture:
+        return capture_moves
+    sq = pos.square_at(row, col)
+    if sq is None or pos.piece_at(sq) == EMPTY:
+        return []
+    occupied = pos.red | pos.black
+    coords = pos.coordinates()
+    moves = []
+    for d in _piece_directions(pos.piece_at(sq)):
+        target = NEIGHBORS[sq][d]
+        if target is not None and not occupied >> target & 1:
+            moves.append(((row, col), coords[target]))
+    return capture_moves + moves
+
+
+def apply_move(pos, move, current_player):
+    """Returns a new bitboard with the move applied, handling captures and king promotion."""
+    (sr, sc), (er, ec) = move
+    start = pos.square_at(sr, sc)
+    end = pos.square_at(er, ec)
+    own, opp = _sides(pos, current_player)
+    if start is None or end is None or not own >> start & 1:
+        logging.error(f"Invalid move: no {current_player} piece at ({sr}, {sc})")
+        return pos
+    if isinstance(move, Move):
+        if move.captured & ~opp:
+            logging.error(f"Invalid capture: {move} jumps a square without an opponent piece")
+            return pos
+    elif abs(er - sr) == 2:
+        mid = pos.square_at((sr + er) // 2, (sc + ec) // 2)
+        if not opp >> mid & 1:
+            logging.error(f"Invalid capture: no opponent piece at {pos.coordinates()[mid]}")
+            return pos
+
+    new_pos = pos.copy()
+    new_pos.make_move(move)
+    return new_pos
@@ -2,20 +2,25 @@ import pygame
 import time
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from src.ui.constants import *
 from src.ui.renderer import Renderer
 from src.ui.menu import MenuBar
 from src.ui.dialogs import show_modal_dialog
 from src.utils.file_handler import save_game, load_game, save_file_dialog, open_file_dialog
-from src.utils.logger import setup_logger
-from src.ai.minimax import minimax
+from src.ai.engine import SearchLimits, create_engine
+from src.ai.iterative import move_time_budget
 from src.game.board import initialize_board, apply_move, board_rect
-from src.game.move_generator import get_possible_moves, get_capturing_moves_from, parse_move, get_all_moves
+from src.game.move_generator import get_possible_moves, get_capturing_moves_from, get_all_moves
+from src.game.move import Move, encode_move, decode_move, move_text
 from src.game.pieces import *
 from src.ui.constants import *
 
-# Setup logging
-setup_logger()
+def history_text(entry):
+    """Renders a (turn, side, codes) history entry as "Turn 1 R: (5,2)->(4,3) | ..." for display"""
+    turn, side, codes = entry
+    moves = " | ".join(move_text(code) for code in codes) if codes else "--"
+    return f"Turn {turn} {'R' if side == RED_PIECE else 'B'}: {moves}"
 
 class CheckersGame:
     def __init__(self):
@@ -53,6 +58,14 @@ class CheckersGame:
         self.time_black = 0
         self.last_timer_update = time.time()
         self.dirty = False
+        
+        # AI search state kept between moves
+        self.engine = create_engine(AI_ENGINE, tt_mb=TT_SIZE_MB, eval_cache_mb=EVAL_CACHE_MB,
+                                    workers=AI_WORKERS, max_depth=AI_MAX_DEPTH, book_path=OPENING_BOOK,
+                                    tablebase_dir=TABLEBASE_DIR)
+        # The AI searches on a worker thread so the window keeps drawing
+        self.ai_executor = ThreadPoolExecutor(max_workers=1)
+        self.ai_future = None
 
     def new_game(self, engine_first=False):
         """Initializes a new game"""
@@ -73,6 +86,7 @@ class CheckersGame:
         self.current_red_moves = []  # Reset move tracking
         self.current_black_moves = []
         self.turn_number = 0
+        self.stop_ai()
         
         logging.debug(f"New game initialized (engine_first={engine_first})")
         
@@ -100,18 +114,18 @@ class CheckersGame:
 
     def run(self):
         """Main game loop"""
-        # If engine moves first, make the first move
+        # If engine moves first, black is to move and the loop starts the search
         if self.engine_first and self.mode == "1P":
-            self.current_player = BLACK_PIECE  # Set current player to black first
-            self.ai_move()
+            self.current_player = BLACK_PIECE
         
         while True:
             self.clock.tick(30)
             self.handle_events()
             self.update_timers()
             
-            if self.mode == "1P" and self.current_player == BLACK_PIECE:
+            if self.mode == "1P" and self.current_player == BLACK_PIECE and self.status == "ACTIVE":
                 self.ai_move()
+            self.poll_ai_move()
                 
             self.draw()
             pygame.display.flip()
@@ -120,6 +134,7 @@ class CheckersGame:
         """Handle pygame events"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                self.stop_ai()
                 pygame.quit()
                 sys.exit()
             
@@ -174,8 +189,7 @@ class CheckersGame:
             if move in possible:
                 # Apply the move
                 self.board = apply_move(self.board, move, self.current_player)
-                move_str = f"({self.selected_piece[0]},{self.selected_piece[1]})->({row},{col})"
-                self.finish_half_turn(self.current_player, move_str)
+                self.finish_half_turn(self.current_player, encode_move(move))
                 
                 # Check for additional captures
                 if abs(row - self.selected_piece[0]) == 2:
@@ -192,10 +206,6 @@ class CheckersGame:
                 self.valid_moves = []
                 self.multi_hop_message = False
                 self.switch_turn()
-                
-                # If it's AI's turn, make the move
-                if self.mode == "1P" and self.current_player == BLACK_PIECE:
-                    self.ai_move()
             else:
                 # If clicking on own piece, select it instead
                 if self.board[row][col].lower() == self.current_player:
@@ -234,7 +244,7 @@ class CheckersGame:
         for move in visible_moves:
             if y + 20 > HEIGHT - STATUS_HEIGHT:
                 break
-            text = self.font.render(move, True, BLACK)
+            text = self.font.render(history_text(move), True, BLACK)
             self.screen.blit(text, (BOARD_AREA_WIDTH + 10, y))
             y += 20
         
@@ -255,6 +265,11 @@ class CheckersGame:
         self.screen.blit(red_text, (10, HEIGHT - STATUS_HEIGHT + 5))
         self.screen.blit(black_text, (WIDTH - black_text.get_width() - 10, HEIGHT - STATUS_HEIGHT + 5))
         self.screen.blit(mode_text, ((WIDTH - mode_text.get_width()) // 2, HEIGHT - STATUS_HEIGHT + 5))
+        
+        if self.ai_thinking():
+            dots = "." * (int(time.time() * 2) % 4)
+            thinking_text = self.font.render(f"Thinking{dots}", True, BLUE)
+            self.screen.blit(thinking_text, ((WIDTH - thinking_text.get_width()) // 2, HEIGHT - STATUS_HEIGHT - 20))
 
     def update_timers(self):
         """Update game timers"""
@@ -269,15 +284,54 @@ class CheckersGame:
         
         self.last_timer_update = current_time
 
+    def ai_thinking(self):
+        """Returns True while a background AI search is running"""
+        return self.ai_future is not None and not self.ai_future.done()
+
     def ai_move(self):
-        """Execute AI's move"""
-        logging.debug("[ai_move] AI turn triggered.")
+        """Start the AI's search on the worker thread; poll_ai_move plays the result"""
         # Verify we're actually black's turn
         if self.current_player != BLACK_PIECE:
             logging.error(f"[ai_move] AI move attempted during {self.current_player}'s turn")
             return
+        if self.ai_future is not None:
+            return  # Already thinking
         
-        _, best_move = minimax(self.board, AI_DEPTH, True, -float('inf'), float('inf'), BLACK_PIECE)
+        logging.debug("[ai_move] AI turn triggered.")
+        budget = move_time_budget(AI_MOVE_TIME, self.time_black, AI_GAME_TIME, AI_MOVES_TO_GO)
+        board = [row[:] for row in self.board]
+        self.ai_future = self.ai_executor.submit(self.search_ai_move, board, budget)
+
+    def search_ai_move(self, board, budget):
+        """Runs on the worker thread: returns the move the AI picks for board"""
+        result = self.engine.search(board, BLACK_PIECE, SearchLimits(time=budget))
+        logging.debug(f"[ai_move] Searched to depth {result.depth} within {budget:.2f}s: PV {result.pv}")
+        return result.move
+
+    def stop_ai(self):
+        """Abandon the running AI search, if any; its result is never played"""
+        if self.ai_future is not None:
+            self.engine.stop()
+        self.ai_future = None
+
+    def poll_ai_move(self):
+        """Play the AI's move once its background search has finished"""
+        future = self.ai_future
+        if future is None or not future.done():
+            return
+        self.ai_future = None
+        if self.mode != "1P" or self.current_player != BLACK_PIECE:
+            logging.debug("[ai_move] Dropped result of a search that is no longer wanted")
+            return
+        try:
+            best_move = future.result()
+        except Exception as e:
+            logging.error(f"[ai_move] AI search failed: {e}")
+            return
+        self.apply_ai_move(best_move)
+
+    def apply_ai_move(self, best_move):
+        """Execute AI's move"""
         if best_move:
             (sr, sc), (er, ec) = best_move
             # Verify we're moving a black piece
@@ -285,14 +339,15 @@ class CheckersGame:
                 logging.error(f"[ai_move] Invalid move attempt: trying to move {self.board[sr][sc]} piece at ({sr},{sc})")
                 return
             
-            move_str = f"({sr},{sc})->({er},{ec})"
             logging.debug(f"[ai_move] Moving black piece from ({sr},{sc}) to ({er},{ec})")
-            self.board = apply_move(self.board, best_move, BLACK_PIECE)
-            self.finish_half_turn(BLACK_PIECE, move_str)
-            logging.debug(f"[ai_move] AI move executed: {move_str}")
+            # A multi-jump is played hop by hop, as a player would click it, and recorded as one move
+            hops = best_move.hops() if isinstance(best_move, Move) else [best_move]
+            for hop in hops:
+                self.board = apply_move(self.board, hop, BLACK_PIECE)
+            self.finish_half_turn(BLACK_PIECE, encode_move(best_move))
+            logging.debug(f"[ai_move] AI move executed: {best_move}")
             self.switch_turn()  # This should switch to RED_PIECE
         else:
-            self.finish_half_turn(BLACK_PIECE, "No moves")
             logging.debug("[ai_move] AI has no moves.")
 
     def handle_menu_action(self, action):
@@ -309,7 +364,6 @@ class CheckersGame:
             # Toggle who moves first and start new game
             self.engine_first = not self.engine_first
             self.new_game(self.engine_first)
-            self.current_red_moves.append(f"Engine First: {self.engine_first}")
             self.dirty = True
         elif action == "Load Game":
             if self.dirty:
@@ -331,6 +385,7 @@ class CheckersGame:
                                          ["Cancel", "Continue"])
                 if result != "Continue":
                     return
+            self.stop_ai()
             pygame.quit()
             sys.exit()
         elif action == "Rules":
@@ -368,57 +423,37 @@ class CheckersGame:
         if not filename:
             return
         try:
-            with open(filename, "r") as f:
-                lines = f.read().splitlines()
+            move_history = load_game(filename)
+            if move_history is None:
+                return
             # Reset game
             self.new_game()
-            # Parse and replay moves
-            turns = {}
-            for line in lines:
-                if line.startswith("Turn"):
-                    parts = line.split()
-                    turn_num = int(parts[1])
-                    side = parts[2].strip(':')
-                    moves_str = line.split(":", 1)[1].strip()
-                    if moves_str == "--":
-                        continue
-                    moves_list = [m.strip() for m in moves_str.split("|")]
-                    if turn_num not in turns:
-                        turns[turn_num] = {}
-                    turns[turn_num][side] = moves_list
-                    self.move_history.append(line)
-            
             # Replay moves in order
-            for t in sorted(turns.keys()):
-                if "R" in turns[t]:
-                    for move_str in turns[t]["R"]:
-                        move = parse_move(move_str)
-                        if move:
-                            self.board = apply_move(self.board, move)
-                if "B" in turns[t]:
-                    for move_str in turns[t]["B"]:
-                        move = parse_move(move_str)
-                        if move:
-                            self.board = apply_move(self.board, move)
+            for turn, side, codes in move_history:
+                for code in codes:
+                    for hop in decode_move(code).hops():
+                        self.board = apply_move(self.board, hop, side)
+                self.turn_number = turn
+            self.move_history = move_history
             logging.debug("Game loaded and moves replayed from file.")
         except Exception as e:
             logging.error(f"Error loading game: {e}")
 
-    def finish_half_turn(self, player, move_str):
-        """Record a move for the current player's half-turn"""
+    def finish_half_turn(self, player, code):
+        """Record a move, packed by encode_move, for the current player's half-turn"""
         if player == RED_PIECE:
-            self.current_red_moves.append(move_str)
+            self.current_red_moves.append(code)
         else:
-            self.current_black_moves.append(move_str)
+            self.current_black_moves.append(code)
 
     def complete_turn(self):
         """Aggregate the current half-turn moves into two history entries with the same turn number"""
         self.turn_number += 1
-        red_entry = f"Turn {self.turn_number} R: " + " | ".join(self.current_red_moves) if self.current_red_moves else f"Turn {self.turn_number} R: --"
-        black_entry = f"Turn {self.turn_number} B: " + " | ".join(self.current_black_moves) if self.current_black_moves else f"Turn {self.turn_number} B: --"
+        red_entry = (self.turn_number, RED_PIECE, tuple(self.current_red_moves))
+        black_entry = (self.turn_number, BLACK_PIECE, tuple(self.current_black_moves))
         self.move_history.append(red_entry)
         self.move_history.append(black_entry)
-        logging.debug(f"Completed turn {self.turn_number}: {red_entry} || {black_entry}")
+        logging.debug(f"Completed turn {self.turn_number}: {history_text(red_entry)} || {history_text(black_entry)}")
         self.current_red_moves.clear()
         self.current_black_moves.clear()
 
@@ -427,10 +462,14 @@ class CheckersGame:
         logging.debug(f"[switch_turn] Switching turn from {self.current_player}")
         self.current_player = BLACK_PIECE if self.current_player == RED_PIECE else RED_PIECE
         logging.debug(f"[switch_turn] Turn switched to {self.current_player}")
+        if self.current_player == RED_PIECE:
+            self.complete_turn()  # Black has answered, so the turn goes into the history
         
         # Update game state
         if self.check_game_over():
             self.status = "COMPLETED"  # Set status to COMPLETED if game is over
+            if self.current_red_moves:
+                self.complete_turn()
         else:
             self.selected_piece = None
             self.valid_moves = []
@@ -465,8 +504,7 @@ class CheckersGame:
             if move in possible:
                 # Apply the move
                 self.board = apply_move(self.board, move, self.current_player)
-                move_str = f"({self.selected_piece[0]},{self.selected_piece[1]})->({row},{col})"
-                self.finish_half_turn(self.current_player, move_str)
+                self.finish_half_turn(self.current_player, encode_move(move))
                 
                 # Check for additional captures
                 if abs(row - self.selected_piece[0]) == 2:
@@ -483,10 +521,6 @@ class CheckersGame:
                 self.valid_moves = []
                 self.multi_hop_message = False
                 self.switch_turn()
-                
-                # If it's AI's turn, make the move
-                if self.mode == "1P" and self.current_player == BLACK_PIECE:
-                    self.ai_move()
             else:
                 # If clicking on own piece, select it instead
                 if self.board[row][col].lower() == self.current_player:
@@ -547,6 +581,8 @@ class CheckersGame:
     def cleanup(self):
         """Cleanup resources"""
         try:
+            self.stop_ai()
+            self.ai_executor.shutdown(wait=False, cancel_futures=True)
             pygame.quit()
         except Exception:
             pass
@@ -0,0 +1,97 @@
+from .zobrist import square_index
+
+class Move(tuple):
+    """
+    A complete move as the generators return it. It unpacks, compares and hashes
+    as its ((r, c), (r, c)) start and end, so it stands in for a plain move tuple,
+    and also carries every square it lands on, the squares it captures as a
+    mask over the 32 playable squares, and whether it crowns the piece.
+    """
+
+    def __new__(cls, path, captured=0, promotion=False):
+        move = tuple.__new__(cls, (path[0], path[-1]))
+        move.path = tuple(path)
+        move.captured = captured
+        move.promotion = promotion
+        return move
+
+    def __getnewargs__(self):
+        return self.path, self.captured, self.promotion
+
+    def hops(self):
+        """Returns the single steps or jumps the move is made of, as plain tuples."""
+        return list(zip(self.path, self.path[1:]))
+
+    def __repr__(self):
+        return "Move(" + "->".join(f"({row},{col})" for row, col in self.path) + ")"
+
+def path_captures(path):
+    """Returns the mask of squares jumped over along path."""
+    captured = 0
+    for (sr, sc), (er, ec) in zip(path, path[1:]):
+        if abs(er - sr) == 2:
+            captured |= 1 << square_index((sr + er) // 2, (sc + ec) // 2)
+    return captured
+
+# Packed moves. The low 16 bits are the from square, the to square (5 bits
+# each, numbered as square_index does) and flags; LIGHT marks a board whose
+# pieces stand on light squares, which square_index numbers mirrored. A
+# multi-jump also keeps the squares it lands on in between above bit 16: a
+# 4-bit count followed by 5 bits per square.
+CAPTURE = 1 << 10
+PROMOTION = 1 << 11
+LIGHT = 1 << 12
+MOVE_MASK = 0xFFFF  # The 16-bit part, which names the move by its start and end only
+NO_MOVE = 0xFFFF  # Never a real move: bits 13-15 are always clear
+EXTENSION_SHIFT = 16
+
+def _cells(light):
+    cells = [None] * 32
+    for row in range(8):
+        for col in range(8):
+            if (row + col) % 2 == (0 if light else 1):
+                cells[square_index(row, col)] = (row, col)
+    return tuple(cells)
+
+# CELLS[light][square] is the (row, col) a square number stands for
+CELLS = (_cells(False), _cells(True))
+
+def encode_move(move):
+    """
+    Packs a Move or a plain ((r, c), (r, c)) into an int. A plain tuple is taken
+    as one step or jump and never marked as a promotion.
+    """
+    path = move.path if isinstance(move, Move) else move
+    (sr, sc), (er, ec) = path[0], path[-1]
+    code = square_index(sr, sc) | square_index(er, ec) << 5
+    if abs(path[1][0] - sr) == 2:
+        code |= CAPTURE
+    if isinstance(move, Move) and move.promotion:
+        code |= PROMOTION
+    if (sr + sc) % 2 == 0:
+        code |= LIGHT
+    if len(path) > 2:
+        extension = len(path) - 2
+        for i, (row, col) in enumerate(path[1:-1]):
+            extension |= square_index(row, col) << (4 + 5 * i)
+        code |= extension << EXTENSION_SHIFT
+    return code
+
+def decode_move(code):
+    """Rebuilds the Move packed by encode_move."""
+    cells = CELLS[code >> 12 & 1]
+    path = [cells[code & 31]]
+    extension = code >> EXTENSION_SHIFT
+    for i in range(extension & 15):
+        path.append(cells[extension >> (4 + 5 * i) & 31])
+    path.append(cells[code >> 5 & 31])
+    return Move(path, path_captures(path) if code & CAPTURE else 0, bool(code & PROMOTION))
+
+def move_ends(code):
+    """Returns the plain ((r, c), (r, c)) start and end of a packed move."""
+    cells = CELLS[code >> 12 & 1]
+    return cells[code & 31], cells[code >> 5 & 31]
+
+def move_text(code):
+    """Renders a packed move for display as "(r,c)->(r,c)", listing every square of a multi-jump."""
+    return "->".join(f"({row},{col})" for row, col in decode_move(code).path)
@@ -1,7 +1,44 @@
 from .pieces import *
 from .board import apply_move
+from . import bitboard
+from .bitboard import BitBoard
+from .move import Move, path_captures
 import logging
 
+PIECE_DIRECTIONS = {
+    RED_PIECE: ((-1, -1), (-1, 1)),  # Red moves upward
+    BLACK_PIECE: ((1, -1), (1, 1)),  # Black moves downward
+    RED_KING: ((-1, -1), (-1, 1), (1, -1), (1, 1)),
+    BLACK_KING: ((-1, -1), (-1, 1), (1, -1), (1, 1)),
+}
+
+OPPONENTS = {
+    RED_PIECE: (BLACK_PIECE, BLACK_KING),
+    RED_KING: (BLACK_PIECE, BLACK_KING),
+    BLACK_PIECE: (RED_PIECE, RED_KING),
+    BLACK_KING: (RED_PIECE, RED_KING),
+}
+
+def _build_tables():
+    """
+    For each piece and square, in direction order: the squares a step reaches and
+    the (over row, over col, landing row, landing col) of each jump that stays on the board.
+    """
+    steps = {}
+    jumps = {}
+    for piece, directions in PIECE_DIRECTIONS.items():
+        steps[piece] = tuple(tuple(tuple((row + dr, col + dc) for dr, dc in directions
+                                         if 0 <= row + dr < 8 and 0 <= col + dc < 8)
+                                   for col in range(8)) for row in range(8))
+        jumps[piece] = tuple(tuple(tuple((row + dr, col + dc, row + 2 * dr, col + 2 * dc) for dr, dc in directions
+                                         if 0 <= row + 2 * dr < 8 and 0 <= col + 2 * dc < 8)
+                                   for col in range(8)) for row in range(8))
+    return steps, jumps
+
+# STEP_TABLE[piece][row][col] and JUMP_TABLE[piece][row][col], built once so the
+# generators below do no arithmetic or bounds checks per move
+STEP_TABLE, JUMP_TABLE = _build_tables()
+
 def parse_move(move_str):
     """
     Parses a move string formatted as "(r,c)->(r,c)" and returns a tuple of tuples: ((r,c), (r,c)).
@@ -22,7 +59,7 @@ def parse_move(move_str):
 def get_all_capturing_moves(board, row, col, moves=None, path=None):
     """
     Recursively finds all possible capturing sequences for a piece.
-    Returns a list of moves, where each move is the complete capturing sequence.
+    Returns a list of Move objects, each a complete capturing sequence.
     """
     if moves is None:
         moves = []
@@ -30,123 +67,129 @@ def get_all_capturing_moves(board, row, col, moves=None, path=None):
         path = [(row, col)]
         
     piece = board[row][col]
-    if piece == RED_PIECE:
-        directions = [(-1, -1), (-1, 1)]
-    elif piece == BLACK_PIECE:
-        directions = [(1, -1), (1, 1)]
-    else:  # King pieces
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    enemies = OPPONENTS[piece]
 
     found_capture = False
-    for dr, dc in directions:
-        mid_r, mid_c = row + dr, col + dc
-        end_r, end_c = row + 2 * dr, col + 2 * dc
-        
-        if (0 <= mid_r < 8 and 0 <= mid_c < 8 and 0 <= end_r < 8 and 0 <= end_c < 8):
-            if board[mid_r][mid_c] in opponent(piece) and board[end_r][end_c] == EMPTY:
-                found_capture = True
-                # Make temporary move
-                new_board = [row[:] for row in board]
-                new_board[row][col] = EMPTY
-                new_board[mid_r][mid_c] = EMPTY
-                new_board[end_r][end_c] = piece
-                
-                # Recursively find more captures
-                new_path = path + [(end_r, end_c)]
-                further_captures = get_all_capturing_moves(new_board, end_r, end_c, moves, new_path)
-                
-                if not further_captures:
-                    # If no more captures possible, add the current sequence
-                    moves.append((path[0], new_path[-1]))
+    for mid_r, mid_c, end_r, end_c in JUMP_TABLE[piece][row][col]:
+        if board[mid_r][mid_c] in enemies and board[end_r][end_c] == EMPTY:
+            found_capture = True
+            # Make temporary move in place, restored after the recursion
+            captured = board[mid_r][mid_c]
+            board[row][col] = EMPTY
+            board[mid_r][mid_c] = EMPTY
+            board[end_r][end_c] = piece
+
+            # Recursively find more captures
+            get_all_capturing_moves(board, end_r, end_c, moves, path + [(end_r, end_c)])
+
+            board[end_r][end_c] = EMPTY
+            board[mid_r][mid_c] = captured
+            board[row][col] = piece
 
     if not found_capture and len(path) > 1:
-        # Add the current sequence if it's a valid capture sequence
-        moves.append((path[0], path[-1]))
-        
+        # The sequence ends here; a man only jumps forward, so reaching its crown row ends it too
+        moves.append(Move(path, path_captures(path), _crowns(piece, row)))
+
     return moves
 
 def get_possible_moves(board, row, col, must_capture=True):
     """Returns a list of legal moves for the piece at (row, col)."""
+    if isinstance(board, BitBoard):
+        return bitboard.get_possible_moves(board, row, col, must_capture)
     moves = []
     piece = board[row][col]
     if piece == EMPTY:
         return moves
 
-    # Determine directions based on piece type
-    if piece == RED_PIECE:
-        directions = [(-1, -1), (-1, 1)]  # Red moves upward
-    elif piece == BLACK_PIECE:
-        directions = [(1, -1), (1, 1)]    # Black moves downward
-    else:  # King pieces (RED_KING or BLACK_KING)
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-
     # First check for captures
+    enemies = OPPONENTS[piece]
     capture_moves = []
-    for dr, dc in directions:
-        mid_r, mid_c = row + dr, col + dc
-        end_r, end_c = row + 2*dr, col + 2*dc
-        if (0 <= end_r < 8 and 0 <= end_c < 8 and 0 <= mid_r < 8 and 0 <= mid_c < 8):
-            mid_piece = board[mid_r][mid_c]
-            if mid_piece != EMPTY and is_opponent(piece, mid_piece) and board[end_r][end_c] == EMPTY:
-                capture_moves.append(((row, col), (end_r, end_c)))
+    for mid_r, mid_c, end_r, end_c in JUMP_TABLE[piece][row][col]:
+        if board[mid_r][mid_c] in enemies and board[end_r][end_c] == EMPTY:
+            capture_moves.append(((row, col), (end_r, end_c)))
 
     # If captures are available and must_capture is True, return only captures
     if capture_moves and must_capture:
         return capture_moves
 
     # Add regular moves if no captures are available or must_capture is False
-    for dr, dc in directions:
-        new_r, new_c = row + dr, col + dc
-        if 0 <= new_r < 8 and 0 <= new_c < 8 and board[new_r][new_c] == EMPTY:
+    for new_r, new_c in STEP_TABLE[piece][row][col]:
+        if board[new_r][new_c] == EMPTY:
             moves.append(((row, col), (new_r, new_c)))
 
     return capture_moves + moves if not must_capture else (capture_moves or moves)
 
 def get_capturing_moves_from(board, row, col):
     """Returns only the capturing moves available from (row, col)."""
+    if isinstance(board, BitBoard):
+        return bitboard.get_capturing_moves_from(board, row, col)
     moves = []
     piece = board[row][col]
     if piece == EMPTY:
         return moves
 
-    if piece == RED_PIECE:
-        directions = [(-1, -1), (-1, 1)]
-    elif piece == BLACK_PIECE:
-        directions = [(1, -1), (1, 1)]
-    else:  # King pieces
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-
-    for dr, dc in directions:
-        mid_r, mid_c = row + dr, col + dc
-        end_r, end_c = row + 2 * dr, col + 2 * dc
-        if (0 <= mid_r < 8 and 0 <= mid_c < 8 and 0 <= end_r < 8 and 0 <= end_c < 8):
-            if board[mid_r][mid_c] in opponent(piece) and board[end_r][end_c] == EMPTY:
-                moves.append(((row, col), (end_r, end_c)))
+    enemies = OPPONENTS[piece]
+    for mid_r, mid_c, end_r, end_c in JUMP_TABLE[piece][row][col]:
+        if board[mid_r][mid_c] in enemies and board[end_r][end_c] == EMPTY:
+            moves.append(((row, col), (end_r, end_c)))
     return moves
 
+def _crowns(piece, row):
+    """Returns True when a man of this kind is crowned on row."""
+    return (piece == RED_PIECE and row == 0) or (piece == BLACK_PIECE and row == 7)
+
 def get_all_moves(board, player, must_capture=True):
-    """Returns all possible moves for the given player"""
+    """
+    Returns all complete moves for the given player as Move objects; a multi-jump
+    is a single move that carries its whole path.
+    """
+    if isinstance(board, BitBoard):
+        return bitboard.get_all_moves(board, player, must_capture)
+    capture_moves = []
     all_moves = []
     for row in range(8):
         for col in range(8):
             piece = board[row][col]
             if piece != EMPTY and piece.lower() == player:
-                moves = get_possible_moves(board, row, col, must_capture)
-                all_moves.extend(moves)
-    
-    # If must_capture is True and there are capture moves, return only captures
-    if must_capture:
-        capture_moves = [move for move in all_moves if abs(move[1][0] - move[0][0]) == 2]
-        if capture_moves:
-            return capture_moves
-    
-    return all_moves
+                jumps = get_all_capturing_moves(board, row, col)
+                # Without forced capture each piece lists its jumps before its steps
+                (capture_moves if must_capture else all_moves).extend(jumps)
+                for new_r, new_c in STEP_TABLE[piece][row][col]:
+                    if board[new_r][new_c] == EMPTY:
+                        all_moves.append(Move(((row, col), (new_r, new_c)), 0, _crowns(piece, new_r)))
+    return capture_moves or all_moves
+
+def move_count(board, player):
+    """
+    Returns the number of steps, or of first jumps when player can capture; the
+    cheap mobility count the bitboard takes from its masks.
+    """
+    if isinstance(board, BitBoard):
+        return bitboard.move_count(board, player)
+    steps = 0
+    jumps = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board[row][col]
+            if piece != EMPTY and piece.lower() == player:
+                enemies = OPPONENTS[piece]
+                for mid_r, mid_c, end_r, end_c in JUMP_TABLE[piece][row][col]:
+                    if board[mid_r][mid_c] in enemies and board[end_r][end_c] == EMPTY:
+                        jumps += 1
+                for new_r, new_c in STEP_TABLE[piece][row][col]:
+                    if board[new_r][new_c] == EMPTY:
+                        steps += 1
+    return jumps or steps
 
 def apply_move(board, move, current_player):
     """
     Returns a new board with the move applied, handling captures and king promotion.
+    A Move is played along its whole path; a plain tuple is a single step or jump.
     """
+    if isinstance(board, BitBoard):
+        return bitboard.apply_move(board, move, current_player)
     new_board = [row[:] for row in board]  # Create a deep copy of the board
+    path = move.path if isinstance(move, Move) else move
     (sr, sc), (er, ec) = move  # start_row, start_col, end_row, end_col
     
     piece = new_board[sr][sc]
@@ -157,12 +200,14 @@ def apply_move(board, move, current_player):
         return board
     
     # Move the piece
-    new_board[er][ec] = piece
     new_board[sr][sc] = EMPTY
+    new_board[er][ec] = piece
     
-    # Handle capture (if move distance is 2, it's a capture)
-    if abs(er - sr) == 2:
-        mid_r, mid_c = (sr + er) // 2, (sc + ec) // 2
+    # Handle captures (a hop that covers two rows is a jump)
+    for (hr, hc), (lr, lc) in zip(path, path[1:]):
+        if abs(lr - hr) != 2:
+            continue
+        mid_r, mid_c = (hr + lr) // 2, (hc + lc) // 2
         captured_piece = new_board[mid_r][mid_c]
         if captured_piece.lower() == current_player:
             logging.error(f"Invalid capture: Cannot capture own piece at ({mid_r}, {mid_c})")
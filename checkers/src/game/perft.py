@@ -0,0 +1,53 @@
+import argparse
+import time
+from .board import initialize_board
+from .bitboard import BitBoard
+from .move_generator import get_all_moves, apply_move
+from .pieces import *
+
+# Leaf counts from the start position with red to move, by depth, counting a
+# whole multi-jump as one move
+REFERENCE_COUNTS = {1: 7, 2: 49, 3: 302, 4: 1469, 5: 7361, 6: 36768, 7: 179740}
+
+def perft(board, player, depth):
+    """Returns the number of move sequences depth moves long from board with player to move."""
+    if depth == 0:
+        return 1
+    opponent = BLACK_PIECE if player == RED_PIECE else RED_PIECE
+    moves = get_all_moves(board, player)
+    if depth == 1:
+        return len(moves)
+    return sum(perft(apply_move(board, move, player), opponent, depth - 1) for move in moves)
+
+def divide(board, player, depth):
+    """Returns [(move, perft of the rest), ...] for each root move, in generator order."""
+    opponent = BLACK_PIECE if player == RED_PIECE else RED_PIECE
+    return [(move, perft(apply_move(board, move, player), opponent, depth - 1))
+            for move in get_all_moves(board, player)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Count move sequences from the start position")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--divide", action="store_true", help="break the deepest count down by root move")
+    parser.add_argument("--bitboard", action="store_true", help="generate on the bitboard instead of the list board")
+    args = parser.parse_args()
+    board = initialize_board()
+    if args.bitboard:
+        board = BitBoard.from_board(board, RED_PIECE)
+    failed = False
+    for depth in range(1, args.depth + 1):
+        start = time.perf_counter()
+        nodes = perft(board, RED_PIECE, depth)
+        elapsed = time.perf_counter() - start
+        expected = REFERENCE_COUNTS.get(depth)
+        check = "" if expected is None else (" ok" if nodes == expected else f" MISMATCH, expected {expected}")
+        failed = failed or (expected is not None and nodes != expected)
+        nps = nodes / elapsed if elapsed > 0 else 0.0
+        print(f"depth {depth:2} {nodes:10} nodes {elapsed:8.3f}s {nps:10.0f} nodes/s{check}")
+    if args.divide:
+        for move, nodes in divide(board, RED_PIECE, args.depth):
+            print(f"    {move} {nodes}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
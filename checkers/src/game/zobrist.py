@@ -0,0 +1,57 @@
+import random
+from .pieces import *
+
+# Fixed seed so every process (and every saved file) agrees on the keys
+ZOBRIST_SEED = 0x5EED_C4EC
+
+_rng = random.Random(ZOBRIST_SEED)
+
+# PIECE_KEYS[kind][square] over the 32 playable squares; kinds are indexed by KIND
+KIND = {RED_PIECE: 0, RED_KING: 1, BLACK_PIECE: 2, BLACK_KING: 3}
+PIECE_KEYS = tuple(tuple(_rng.getrandbits(64) for _ in range(32)) for _ in range(4))
+SIDE_KEY = _rng.getrandbits(64)  # XORed in when black is to move
+
+def square_index(row, col):
+    """Maps (row, col) to a playable square number, mirroring light squares the way BitBoard does."""
+    if (row + col) % 2 == 0:
+        col = 7 - col
+    return row * 4 + col // 2
+
+def position_key(red, black, kings, black_to_move=False):
+    """Computes the Zobrist key of a position from its masks."""
+    key = SIDE_KEY if black_to_move else 0
+    for kind, mask in ((0, red & ~kings), (1, red & kings), (2, black & ~kings), (3, black & kings)):
+        keys = PIECE_KEYS[kind]
+        while mask:
+            low = mask & -mask
+            key ^= keys[low.bit_length() - 1]
+            mask ^= low
+    return key
+
+def board_key(board, player=RED_PIECE):
+    """Computes the Zobrist key of an 8x8 list-of-lists board with player to move."""
+    key = SIDE_KEY if player == BLACK_PIECE else 0
+    for row in range(8):
+        for col in range(8):
+            piece = board[row][col]
+            if piece != EMPTY:
+                key ^= PIECE_KEYS[KIND[piece]][square_index(row, col)]
+    return key
+
+def update_key(key, board, move):
+    """
+    Returns key updated for a move about to be applied to a list-of-lists board.
+    The side-to-move term is left alone, since a multi-jump keeps the same player.
+    """
+    (sr, sc), (er, ec) = move
+    piece = board[sr][sc]
+    landed = piece
+    if piece == RED_PIECE and er == 0:
+        landed = RED_KING
+    elif piece == BLACK_PIECE and er == 7:
+        landed = BLACK_KING
+    key ^= PIECE_KEYS[KIND[piece]][square_index(sr, sc)] ^ PIECE_KEYS[KIND[landed]][square_index(er, ec)]
+    if abs(er - sr) == 2:
+        mr, mc = (sr + er) // 2, (sc + ec) // 2
+        key ^= PIECE_KEYS[KIND[board[mr][mc]]][square_index(mr, mc)]
+    return key
@@ -1,9 +1,11 @@
 from src.game.checkers_game import CheckersGame
+from src.utils.logger import setup_logger
 
 def main():
+    # Logging is set up by the application, so importing the game (as the tests do) writes no log file
+    setup_logger()
     game = CheckersGame()
     game.run()
 
 if __name__ == "__main__":
     main()
-
@@ -1,28 +1,20 @@
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 from src.game.pieces import EMPTY, RED_PIECE, BLACK_PIECE, RED_KING, BLACK_KING
-from src.game.move_generator import get_possible_moves, apply_move
-
-@dataclass
-class Move:
-    player: str
-    from_pos: Tuple[int, int]
-    to_pos: Tuple[int, int]
-    timestamp: datetime = datetime.now()
-
-    def __str__(self):
-        return f"({self.from_pos[0]},{self.from_pos[1]})->({self.to_pos[0]},{self.to_pos[1]})"
+from src.game.move_generator import get_possible_moves, get_capturing_moves_from, get_all_moves, apply_move
+from src.game.move import Move, encode_move, decode_move, move_text, PROMOTION
+from src.game.zobrist import SIDE_KEY, board_key, update_key
 
 class GameInstance:
     def __init__(self, game_id: str, must_capture: bool = True):
         self.game_id = game_id
         self.board = [[EMPTY for _ in range(8)] for _ in range(8)]
         self.current_turn = RED_PIECE
-        self.move_history: List[Move] = []
+        self.move_history: List[int] = []  # Every hop played, packed by encode_move
         self.status = "PENDING"  # PENDING, ACTIVE, COMPLETED, DRAWN
         self.must_capture = must_capture
         self._initialize_board()
+        # Zobrist key of the board and side to move, updated incrementally by each move
+        self.position_key = board_key(self.board, self.current_turn)
 
     def _initialize_board(self):
         """Set up the initial board state"""
@@ -45,8 +37,16 @@ class GameInstance:
         self.status = "ACTIVE"
         return True
 
-    def make_move(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> bool:
-        """Attempt to make a move. Returns True if successful."""
+    def make_move(self, from_pos: Union[Tuple[int, int], Move, int], to_pos: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Attempt to make a move. Given from_pos and to_pos, to_pos may be the next hop of
+        a jump or where a whole multi-jump ends, if no other multi-jump ends there too.
+        A Move or its packed code passed alone plays every hop of its own path.
+        Returns True if successful.
+        """
+        if to_pos is None:
+            return self._play_path(decode_move(from_pos) if isinstance(from_pos, int) else from_pos)
+
         if not self._validate_move_input(from_pos, to_pos):
             return False
         
@@ -61,21 +61,21 @@ class GameInstance:
         move = (from_pos, to_pos)
         
         if move not in valid_moves:
-            return False
+            # Two multi-jumps may share their ends while capturing different pieces
+            full_moves = [full_move for full_move in get_all_moves(self.board, self.current_turn, self.must_capture)
+                          if full_move == move and len(full_move.path) > 2]
+            return len(full_moves) == 1 and self._play_path(full_moves[0])
 
-        # Record and apply the move
-        self.move_history.append(Move(
-            player=self.current_turn,
-            from_pos=from_pos,
-            to_pos=to_pos
-        ))
-        
+        # Apply and record the move
         old_piece = self.board[row][col]
+        self.position_key = update_key(self.position_key, self.board, move)
         self.board = apply_move(self.board, move, self.current_turn)
+        self.move_history.append(encode_move(move))
         
         # End turn if king promotion occurred
         if ((old_piece == RED_PIECE and self.board[to_pos[0]][to_pos[1]] == RED_KING) or
             (old_piece == BLACK_PIECE and self.board[to_pos[0]][to_pos[1]] == BLACK_KING)):
+            self.move_history[-1] |= PROMOTION
             self._switch_turn()
             return True
         
@@ -90,6 +90,18 @@ class GameInstance:
         self.check_game_over()
         return True
 
+    def _play_path(self, move: Move) -> bool:
+        """Plays a generated move hop by hop, stopping at the first hop that fails."""
+        if not isinstance(move, Move) or self.status != "ACTIVE":
+            return False
+        if not any(full_move.path == move.path
+                   for full_move in get_all_moves(self.board, self.current_turn, self.must_capture)):
+            return False
+        for hop_from, hop_to in move.hops():
+            if not self.make_move(hop_from, hop_to):
+                return False
+        return True
+
     def get_valid_moves(self, pos: Tuple[int, int]) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
         """Get valid moves for a piece at the given position"""
         if self.status != "ACTIVE":
@@ -137,6 +149,7 @@ class GameInstance:
     def _switch_turn(self):
         """Switch the current turn"""
         self.current_turn = BLACK_PIECE if self.current_turn == RED_PIECE else RED_PIECE
+        self.position_key ^= SIDE_KEY
 
     def get_state(self):
         """Get the current game state"""
@@ -145,7 +158,8 @@ class GameInstance:
             "board": self.board,
             "current_turn": self.current_turn,
             "status": self.status,
-            "moves": [str(move) for move in self.move_history]
+            "position_key": self.position_key,
+            "moves": [move_text(code) for code in self.move_history]
         }
 
     def _validate_move_input(self, from_pos: Tuple[int, int], to_pos: Tuple[int, int]) -> bool:
@@ -1,6 +1,8 @@
 from typing import List, Optional
 from uuid import uuid4
 from .game_instance import GameInstance
+from src.ai.engine import Engine, SearchLimits, SearchResult, create_engine
+from src.game.pieces import RED_PIECE
 
 class Match:
     def __init__(self, engine1_id: str, engine2_id: str, games_count: int = 3, must_capture: bool = True):
@@ -13,6 +15,7 @@ class Match:
         self.games_count = games_count
         self.scores = {engine1_id: 0, engine2_id: 0}
         self.must_capture = must_capture
+        self._engines = {}  # Engine instances by id, created on first use
 
     def start_match(self) -> bool:
         """Start the match and its first game"""
@@ -63,6 +66,34 @@ class Match:
 
         return None
 
+    def get_engine(self, engine_id: str) -> Engine:
+        """Resolve an engine id to its engine instance; ids are names registered in src.ai.engine"""
+        engine = self._engines.get(engine_id)
+        if engine is None:
+            engine = create_engine(engine_id)
+            self._engines[engine_id] = engine
+        return engine
+
+    def engine_to_move(self) -> Optional[str]:
+        """Get the id of the engine whose turn it is; engine 1 plays red in the first game, then colours alternate"""
+        game = self.get_current_game()
+        if not game or game.status != "ACTIVE":
+            return None
+        engine1_red = self.current_game_index % 2 == 0
+        return self.engine1_id if (game.current_turn == RED_PIECE) == engine1_red else self.engine2_id
+
+    def play_engine_move(self, limits: Optional[SearchLimits] = None) -> Optional[SearchResult]:
+        """Let the engine to move search the current game and play its move"""
+        engine_id = self.engine_to_move()
+        if engine_id is None:
+            return None
+        game = self.get_current_game()
+        engine = self.get_engine(engine_id)
+        result = engine.search(game.board, game.current_turn, limits or SearchLimits(time=1.0))
+        if result.move is None or not game.make_move(result.move):
+            return None
+        return result
+
     def get_current_game(self) -> Optional[GameInstance]:
         """Get the current active game instance"""
         return self.game_instances[self.current_game_index] if self.game_instances else None
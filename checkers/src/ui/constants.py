@@ -25,4 +25,13 @@ MENU_HOVER = (170, 170, 170)
 # Game modes
 MODE_2P = "2P"
 MODE_1P = "1P"
-AI_DEPTH = 3
\ No newline at end of file
+AI_MOVE_TIME = 1.0      # Seconds the AI aims to spend on a move
+AI_GAME_TIME = 600      # Seconds on the AI's clock for a whole game
+AI_MOVES_TO_GO = 30     # Moves the remaining clock is spread over
+AI_ENGINE = "alphabeta"  # Name registered in src.ai.engine
+AI_MAX_DEPTH = 20
+AI_WORKERS = 1          # Processes for the root split; 1 searches in the game process
+TT_SIZE_MB = 16  # Transposition table size for the AI search
+EVAL_CACHE_MB = 4  # Evaluation cache size for the AI search
+OPENING_BOOK = "opening_book.bin"  # Built with python -m src.ai.book; the AI plays from it when present
+TABLEBASE_DIR = "tablebases"  # Built with python -m src.ai.tablebase; probed by the AI search when present
@@ -26,24 +26,52 @@ def save_file_dialog():
     return filename
 
 def save_game(filename, move_history):
-    """Saves the game move history to a file"""
+    """
+    Saves the game move history to a file. Each (turn, side, codes) entry is
+    one line: the turn number, the side's piece letter and its moves packed
+    by encode_move, in hex.
+    """
     try:
         with open(filename, "w") as f:
-            for line in move_history:
-                f.write(line + "\n")
+            for turn, side, codes in move_history:
+                f.write(" ".join([str(turn), side] + [f"{code:x}" for code in codes]) + "\n")
         logging.debug(f"Game saved to {filename}")
         return True
     except Exception as e:
         logging.error(f"Error saving game: {e}")
         return False
 
+def parse_history_line(line):
+    """
+    Parses one saved line into (turn, side, codes), or None for a blank line.
+    Also reads the older "Turn 1 R: (5,2)->(4,3) | ..." lines, skipping notes
+    that are not moves.
+    """
+    if line.startswith("Turn"):
+        # The game package imports this module, so import it here
+        from src.game.move import encode_move
+        from src.game.move_generator import parse_move
+        heading, moves = line.split(":", 1)
+        _, turn, side = heading.split()
+        codes = []
+        for move_str in moves.split("|"):
+            if "->" in move_str:
+                move = parse_move(move_str)
+                if move:
+                    codes.append(encode_move(move))
+        return int(turn), side.lower(), tuple(codes)
+    parts = line.split()
+    if not parts:
+        return None
+    return int(parts[0]), parts[1], tuple(int(code, 16) for code in parts[2:])
+
 def load_game(filename):
-    """Loads a game from a file and returns the move history"""
+    """Loads a game from a file and returns its move history as save_game writes it"""
     try:
         with open(filename, "r") as f:
-            move_history = f.read().splitlines()
+            move_history = [entry for entry in map(parse_history_line, f.read().splitlines()) if entry]
         logging.debug(f"Game loaded from {filename}")
         return move_history
     except Exception as e:
         logging.error(f"Error loading game: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,92 @@
+import pytest
+from src.ai.book import OpeningBook, build_book, book_moves, write_book
+from src.ai.engine import create_engine, SearchLimits
+from src.ai.minimax import SearchContext
+from src.ai.transposition import TranspositionTable
+from src.game.bitboard import BitBoard
+from src.game.board import initialize_board
+from src.game.move_generator import get_all_moves
+from src.game.pieces import EMPTY, RED_PIECE, BLACK_PIECE, RED_KING
+from src.game.zobrist import board_key
+
+def test_book_probe_finds_every_key(tmp_path):
+    """Test that binary search finds each position's moves and nothing else"""
+    path = tmp_path / "book.bin"
+    moves = {key: [(((5, 0), (4, 1)), key % 7 + 1)] for key in range(1, 200, 3)}
+    moves[100] = [(((5, 2), (4, 3)), 10), (((5, 2), (4, 1)), 30)]
+    write_book(path, moves)
+    book = OpeningBook(path)
+    try:
+        for key, entries in moves.items():
+            assert sorted(book.probe(key)) == sorted(entries)
+        assert book.probe(0) == []
+        assert book.probe(2) == []
+        assert book.probe(1 << 63) == []
+    finally:
+        book.close()
+
+def _shared_ends_board():
+    """A red king that reaches (4, 1) from (0, 5) by two paths taking different pieces"""
+    board = [[EMPTY] * 8 for _ in range(8)]
+    board[0][5] = RED_KING
+    board[6][1] = RED_PIECE
+    for row, col in ((1, 4), (1, 6), (3, 4), (3, 6), (4, 7), (5, 4), (5, 2)):
+        board[row][col] = BLACK_PIECE
+    return board
+
+def test_book_skips_moves_whose_ends_name_several_paths(tmp_path):
+    """Test that choose only answers with moves the stored start and end pin down"""
+    board = _shared_ends_board()
+    legal = get_all_moves(BitBoard.from_board(board, RED_PIECE), RED_PIECE)
+    shared = [move for move in legal if move == ((0, 5), (4, 1))]
+    assert len(shared) == 2
+    single = next(move for move in legal if move == ((6, 1), (0, 3)))
+    path = tmp_path / "book.bin"
+    key = board_key(board, RED_PIECE)
+    write_book(path, {key: [(shared[0], 90), (single, 10)]})
+    book = OpeningBook(path)
+    try:
+        for _ in range(20):
+            assert book.choose(board, RED_PIECE).path == single.path
+        write_book(path, {key: [(shared[1], 10)]})
+    finally:
+        book.close()
+    book = OpeningBook(path)
+    try:
+        assert book.choose(board, RED_PIECE) is None
+    finally:
+        book.close()
+
+def test_built_book_serves_engine(tmp_path):
+    """Test that a self-play book covers the start position and engines play from it"""
+    path = tmp_path / "book.bin"
+    assert build_book(path, games=2, plies=3, depth=3, seed=1, tt_mb=1) >= 3
+    board = initialize_board()
+    book = OpeningBook(path)
+    assert book.probe(board_key(board, 'r'))
+    book.close()
+    result = create_engine("alphabeta", tt_mb=1, book_path=path).search(board, 'r', SearchLimits(depth=3))
+    assert result.move in get_all_moves(board, 'r')
+    assert result.nodes == 0
+
+def test_missing_or_invalid_book(tmp_path):
+    """Test that a missing book is skipped and a foreign file is rejected"""
+    assert OpeningBook.open_if_exists(tmp_path / "none.bin") is None
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a book at all")
+    with pytest.raises(ValueError):
+        OpeningBook(path)
+    assert OpeningBook.open_if_exists(path) is None
+
+def test_book_moves_for_black():
+    """Test that a black ply keeps the moves best for black, not for red"""
+    board = [[EMPTY] * 8 for _ in range(8)]
+    board[0][1] = BLACK_PIECE
+    board[2][5] = BLACK_PIECE
+    board[4][3] = RED_PIECE
+    board[7][0] = RED_PIECE
+    context = SearchContext(TranspositionTable(1), quiescence=True)
+    entries = book_moves(BitBoard.from_board(board, BLACK_PIECE), BLACK_PIECE, 3, 0.25, context)
+    moves = [move for move, _ in entries]
+    assert moves and ((2, 5), (3, 4)) not in moves  # Hangs the man to (4,3)
+    assert max(weight for _, weight in entries) == 100
@@ -0,0 +1,110 @@
+import io
+import json
+import pytest
+from src.ai.engine import SearchLimits, SearchResult, available_engines, create_engine, principal_variation
+from src.ai.transposition import TranspositionTable, EXACT
+from src.game.bitboard import BitBoard
+from src.game.board import initialize_board
+from src.game.move_generator import get_all_moves, apply_move
+from src.game.zobrist import board_key
+from src.game.pieces import EMPTY, RED_PIECE, BLACK_PIECE, RED_KING, BLACK_KING
+from src.match.match import Match
+
+def test_alphabeta_engine_result():
+    """Test that the registered alpha-beta engine returns a full search result"""
+    assert "alphabeta" in available_engines()
+    engine = create_engine("alphabeta", tt_mb=1)
+    board = initialize_board()
+    result = engine.search(board, BLACK_PIECE, SearchLimits(depth=4))
+    assert result.move in get_all_moves(board, BLACK_PIECE)
+    assert result.depth == 4
+    assert result.pv[0] == result.move
+    assert 1 <= len(result.pv) <= 4
+    assert result.nodes > 0
+    assert result.time > 0
+
+def test_unknown_engine_rejected():
+    """Test that an unregistered engine name raises"""
+    with pytest.raises(ValueError):
+        create_engine("no-such-engine")
+
+def test_match_resolves_engine_ids():
+    """Test that a match plays moves with the engines its ids name"""
+    match = Match("alphabeta", "alphabeta", games_count=1)
+    assert match.start_match()
+    assert match.engine_to_move() == "alphabeta"
+    result = match.play_engine_move(SearchLimits(depth=2))
+    assert result is not None
+    assert match.get_current_game().current_turn == BLACK_PIECE
+
+class _ScriptedEngine:
+    name = "scripted"
+
+    def __init__(self, move):
+        self.move = move
+
+    def search(self, board, player, limits):
+        return SearchResult(self.move, 0.0, [self.move])
+
+def test_match_plays_the_searched_path(same_ends_board):
+    """Test that a match plays the engine's own multi-jump when another one shares its ends"""
+    for move in get_all_moves(same_ends_board, RED_PIECE):
+        match = Match("scripted", "alphabeta", games_count=1)
+        match.start_match()
+        game = match.get_current_game()
+        game.board = [row[:] for row in same_ends_board]
+        game.position_key = board_key(game.board, RED_PIECE)
+        match._engines["scripted"] = _ScriptedEngine(move)
+        assert match.play_engine_move() is not None
+        assert game.board == apply_move(same_ends_board, move, RED_PIECE)
+
+def test_search_statistics_stream():
+    """Test that a search reports per-depth statistics and streams them as JSON lines"""
+    stream = io.StringIO()
+    engine = create_engine("alphabeta", tt_mb=1, stats_stream=stream)
+    result = engine.search(initialize_board(), RED_PIECE, SearchLimits(depth=3))
+    stats = result.stats
+    assert [it.depth for it in stats.iterations] == [1, 2, 3]
+    assert stats.iterations[0].ebf is None and stats.iterations[2].ebf > 0
+    assert sum(it.nodes for it in stats.iterations) == stats.nodes
+    assert stats.nodes + stats.qnodes == result.nodes
+    assert stats.tt_probes >= stats.tt_hits > 0
+    assert stats.nps > 0
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [r["type"] for r in records] == ["iteration"] * 3 + ["search"]
+    assert records[-1]["nodes"] == stats.nodes
+
+def _flipped(board):
+    """The same position seen from the other side: rotated half a turn with the colours swapped"""
+    swap = {RED_PIECE: BLACK_PIECE, BLACK_PIECE: RED_PIECE, RED_KING: BLACK_KING, BLACK_KING: RED_KING}
+    return [[swap.get(piece, piece) for piece in reversed(row)] for row in reversed(board)]
+
+@pytest.mark.parametrize("name", ["alphabeta", "mtdf"])
+def test_black_does_not_hang_a_piece(name):
+    """Test that a black search plays for black: (2,5)->(3,4) loses a man to (4,3)"""
+    board = [[EMPTY] * 8 for _ in range(8)]
+    board[0][1] = BLACK_PIECE
+    board[2][5] = BLACK_PIECE
+    board[4][3] = RED_PIECE
+    board[7][0] = RED_PIECE
+    for depth in (2, 4):
+        black = create_engine(name, tt_mb=1).search(board, BLACK_PIECE, SearchLimits(depth=depth))
+        assert black.move != ((2, 5), (3, 4))
+        assert black.score > -0.5  # From black's side: no man down
+        # The colour-swapped position with red to move is searched to the same score
+        red = create_engine(name, tt_mb=1).search(_flipped(board), RED_PIECE, SearchLimits(depth=depth))
+        assert red.score == pytest.approx(black.score)
+
+def test_principal_variation_stops_at_shared_ends():
+    """Test that a stored move whose start and end fit two multi-jumps ends the line"""
+    board = [[EMPTY] * 8 for _ in range(8)]
+    board[0][5] = RED_KING
+    board[6][1] = RED_PIECE
+    for row, col in ((1, 4), (1, 6), (3, 4), (3, 6), (4, 7), (5, 4), (5, 2)):
+        board[row][col] = BLACK_PIECE
+    key = BitBoard.from_board(board, RED_PIECE).key
+    tt = TranspositionTable(1)
+    tt.store(key, 3, 0.0, EXACT, ((0, 5), (4, 1)))
+    assert principal_variation(board, RED_PIECE, tt, 3) == []
+    tt.store(key, 3, 0.0, EXACT, ((6, 1), (0, 3)))
+    assert [move.path for move in principal_variation(board, RED_PIECE, tt, 1)] == [((6, 1), (4, 3), (2, 5), (0, 3))]
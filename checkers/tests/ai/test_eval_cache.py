@@ -0,0 +1,37 @@
+import pytest
+from src.ai.eval_cache import EvalCache
+from src.ai.evaluator import evaluate_board
+from src.ai.minimax import minimax, SearchContext
+from src.game.bitboard import BitBoard
+from src.game.board import initialize_board
+from src.game.pieces import RED_PIECE, BLACK_PIECE
+
+def test_cached_evaluation_matches_and_counts():
+    """Test that a repeated evaluation is a hit and returns the same score"""
+    cache = EvalCache(size_mb=1)
+    board = initialize_board()
+    pos = BitBoard.from_board(board)
+    first = evaluate_board(pos, cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert evaluate_board(pos, cache) == first == evaluate_board(board)
+    assert evaluate_board(board, cache) == first  # Same key as the packed board
+    assert cache.hits == 2
+    assert cache.hit_rate() == pytest.approx(2 / 3)
+
+def test_both_sides_to_move_share_an_entry():
+    """Test that the same pieces with black to move are answered from the red-to-move entry"""
+    cache = EvalCache(size_mb=1)
+    board = initialize_board()
+    red = evaluate_board(BitBoard.from_board(board, RED_PIECE), cache)
+    assert evaluate_board(BitBoard.from_board(board, BLACK_PIECE), cache) == red
+    assert evaluate_board(board, cache) == red
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_search_with_cache_matches_plain_search():
+    """Test that the evaluation cache does not change the search result"""
+    board = initialize_board()
+    cache = EvalCache(size_mb=1)
+    plain = minimax(board, 4, True, float('-inf'), float('inf'), BLACK_PIECE, SearchContext())
+    cached = minimax(board, 4, True, float('-inf'), float('inf'), BLACK_PIECE, SearchContext(eval_cache=cache))
+    assert cached == plain
+    assert cache.hits > 0
@@ -0,0 +1,64 @@
+import time
+import pytest
+from src.ai.iterative import iterative_deepening, move_time_budget, start_search
+from src.ai.stats import SearchStats
+from src.ai.transposition import TranspositionTable
+from src.game.board import initialize_board
+from src.game.move_generator import get_all_moves
+from src.game.pieces import RED_PIECE, BLACK_PIECE
+
+def test_budget_shrinks_with_the_game_clock():
+    """Test that the per-move budget respects the remaining game clock"""
+    assert move_time_budget(2.0) == 2.0
+    assert move_time_budget(2.0, clock_used=0, game_time=300, moves_to_go=30) == 2.0
+    assert move_time_budget(2.0, clock_used=270, game_time=300, moves_to_go=30) == pytest.approx(1.0)
+    assert move_time_budget(2.0, clock_used=300, game_time=300, min_time=0.05) == 0.05
+
+def test_returns_legal_move_within_budget():
+    """Test that the search stops close to its time limit with a legal move"""
+    board = initialize_board()
+    start = time.perf_counter()
+    score, move, depth = iterative_deepening(board, BLACK_PIECE, 0.3, tt=TranspositionTable(1))
+    assert time.perf_counter() - start < 1.0
+    assert depth >= 1
+    assert move in get_all_moves(board, BLACK_PIECE)
+
+def test_stops_at_max_depth():
+    """Test that a generous budget still honours the depth cap"""
+    score, move, depth = iterative_deepening(initialize_board(), RED_PIECE, 60, max_depth=2)
+    assert depth == 2
+    assert move is not None
+
+def test_stop_returns_best_so_far():
+    """Test that a stopped search returns promptly with the deepest completed move"""
+    board = initialize_board()
+    handle = start_search(board, RED_PIECE, 60, tt=TranspositionTable(1))
+    time.sleep(0.2)
+    best = handle.best_so_far()
+    assert best[1] in get_all_moves(board, RED_PIECE)
+    start = time.perf_counter()
+    handle.stop()
+    score, move, depth = handle.wait(timeout=5)
+    assert time.perf_counter() - start < 1.0
+    assert handle.done()
+    assert depth >= best[2]
+    assert move in get_all_moves(board, RED_PIECE)
+
+def test_pvs_and_aspiration_keep_result():
+    """Test that PVS and aspiration windows return the plain search's move and score"""
+    board = initialize_board()
+    plain = iterative_deepening(board, BLACK_PIECE, float('inf'), 6, TranspositionTable(1))
+    stats = SearchStats()
+    fast = iterative_deepening(board, BLACK_PIECE, float('inf'), 6, TranspositionTable(1), stats=stats,
+                               pvs=True, aspiration=True)
+    assert fast == plain
+    assert stats.pvs_researches > 0
+
+def test_late_move_reductions_are_counted():
+    """Test that late move reductions reduce quiet moves and report their re-searches"""
+    board = initialize_board()
+    stats = SearchStats()
+    score, move, depth = iterative_deepening(board, RED_PIECE, float('inf'), 7, TranspositionTable(1),
+                                             stats=stats, pvs=True, lmr_moves=2)
+    assert move in get_all_moves(board, RED_PIECE)
+    assert stats.lmr_reductions > stats.lmr_researches > 0
@@ -0,0 +1,30 @@
+from src.ai.engine import create_engine, SearchLimits
+from src.ai.mcts import MCTS
+from src.game.board import initialize_board
+from src.game.move_generator import get_all_moves, apply_move
+
+def test_mcts_respects_playout_limit():
+    """Test that MCTS runs exactly the requested playouts and returns a legal move"""
+    board = initialize_board()
+    result = create_engine("mcts", seed=1).search(board, 'r', SearchLimits(nodes=200))
+    assert result.nodes == 200
+    assert result.move in get_all_moves(board, 'r')
+    assert 0.0 <= result.score <= 1.0
+    assert result.pv[0] == result.move
+
+def test_mcts_stops_on_time():
+    """Test that a time-limited search returns promptly with a move"""
+    result = create_engine("mcts", seed=1).search(initialize_board(), 'r', SearchLimits(time=0.2))
+    assert result.move is not None
+    assert result.time < 1.0
+
+def test_mcts_reuses_subtree():
+    """Test that the tree below the played moves carries over to the next search"""
+    tree = MCTS(seed=1)
+    board = initialize_board()
+    move, _, _ = tree.search(board, 'r', playouts=400)
+    reply = tree.best_child(tree.best_child(tree.root))
+    board = apply_move(apply_move(board, move, 'r'), reply.move, 'b')
+    tree.search(board, 'r', playouts=50)
+    assert tree.reused > 0
+    assert tree.root.parent is None
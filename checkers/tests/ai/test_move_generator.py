@@ -1,6 +1,6 @@
 import pytest
-from src.game.pieces import RED_PIECE, BLACK_PIECE, EMPTY
-from src.game.move_generator import get_possible_moves
+from src.game.pieces import RED_PIECE, BLACK_PIECE, RED_KING, EMPTY
+from src.game.move_generator import get_possible_moves, STEP_TABLE, JUMP_TABLE
 
 def test_must_capture_setting():
     """Test that MUST_CAPTURE setting correctly affects available moves"""
@@ -49,4 +49,12 @@ def test_must_capture_multiple_options():
     moves_optional_capture = get_possible_moves(board, 6, 1, must_capture=False)
     assert len(moves_optional_capture) >= 2  # Should include at least the capture moves
     # Should include both captures and any available regular moves
-    assert any(abs(start[0] - end[0]) == 2 for start, end in moves_optional_capture)  # Should have captures
\ No newline at end of file
+    assert any(abs(start[0] - end[0]) == 2 for start, end in moves_optional_capture)  # Should have captures
+
+def test_lookup_tables_stay_on_board():
+    """Test that the step and jump tables only hold on-board squares, in direction order"""
+    assert STEP_TABLE[RED_PIECE][5][0] == ((4, 1),)
+    assert JUMP_TABLE[RED_PIECE][5][0] == ((4, 1, 3, 2),)
+    assert STEP_TABLE[BLACK_PIECE][7][2] == ()
+    assert STEP_TABLE[RED_KING][3][4] == ((2, 3), (2, 5), (4, 3), (4, 5))
+    assert JUMP_TABLE[RED_KING][1][6] == ((2, 5, 3, 4),)
@@ -0,0 +1,25 @@
+import pytest
+from src.ai.benchmark import BENCHMARK_POSITIONS, parse_diagram, run_benchmark
+from src.ai.minimax import minimax, SearchContext
+from src.ai.mtdf import mtdf
+from src.ai.transposition import TranspositionTable
+
+@pytest.mark.parametrize("label, player, rows", BENCHMARK_POSITIONS[:4])
+def test_mtdf_matches_minimax_value(label, player, rows):
+    """Test that MTD(f) converges on the alpha-beta value from any guess"""
+    board = parse_diagram(rows)
+    expected, _ = minimax(board, 5, True, float('-inf'), float('inf'), player, SearchContext())
+    for guess in (0.0, 3.0, -3.0):
+        score, move, passes = mtdf(board, 5, player, guess, SearchContext(TranspositionTable(1)))
+        assert score == pytest.approx(expected)
+        assert move is not None
+        assert passes >= 1
+
+def test_benchmark_runs_both_engines():
+    """Test that the benchmark searches every position with each engine"""
+    report = run_benchmark(("alphabeta", "mtdf"), depth=3, tt_mb=1)
+    for totals in report.values():
+        assert len(totals["results"]) == len(BENCHMARK_POSITIONS)
+        assert totals["nodes"] > 0
+    alphabeta, mtdf_results = report["alphabeta"]["results"], report["mtdf"]["results"]
+    assert [r.score for r in alphabeta] == pytest.approx([r.score for r in mtdf_results])
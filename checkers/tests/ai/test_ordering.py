@@ -0,0 +1,38 @@
+from src.ai.minimax import minimax, SearchContext
+from src.ai.ordering import MoveOrderer
+from src.game.bitboard import BitBoard
+from src.game.board import initialize_board
+from src.game.move_generator import get_all_moves
+from src.game.pieces import RED_PIECE, BLACK_PIECE, RED_KING
+
+def test_hash_move_first_then_promotions_then_killers(empty_board):
+    """Test the order of the move classes"""
+    empty_board[1][2] = RED_PIECE   # Can promote
+    empty_board[5][4] = RED_KING
+    pos = BitBoard.from_board(empty_board)
+    moves = get_all_moves(pos, RED_PIECE)
+    orderer = MoveOrderer()
+    killer = ((5, 4), (6, 5))
+    orderer.record_cutoff(pos, killer, 3, 2)
+    hash_move = ((5, 4), (4, 3))
+
+    ordered = orderer.order(pos, moves, hash_move, 3)
+    assert sorted(ordered) == sorted(moves)
+    assert ordered[0] == hash_move
+    assert set(ordered[1:3]) == {((1, 2), (0, 1)), ((1, 2), (0, 3))}
+    assert ordered[3] == killer
+
+def test_history_orders_quiet_moves():
+    """Test that quiet moves that caused cutoffs at other plies move up"""
+    pos = BitBoard.from_board(initialize_board())
+    moves = get_all_moves(pos, RED_PIECE)
+    orderer = MoveOrderer()
+    orderer.record_cutoff(pos, moves[-1], 10, 4)
+    assert orderer.order(pos, moves, None, 0)[0] == moves[-1]
+
+def test_cutoff_statistics():
+    """Test that the search reports how often the first move cut off"""
+    context = SearchContext()
+    minimax(initialize_board(), 4, True, float('-inf'), float('inf'), BLACK_PIECE, context)
+    assert context.beta_cutoffs > 0
+    assert 0 < context.first_move_cutoff_rate() <= 1
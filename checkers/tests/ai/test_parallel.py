@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from src.ai import parallel
+from src.ai.benchmark import BENCHMARK_POSITIONS, parse_diagram
+from src.ai.engine import create_engine, SearchLimits
+from src.ai.minimax import minimax, SearchContext, SearchTimeout
+from src.ai.parallel import encode_position, decode_position
+from src.ai.transposition import TranspositionTable
+from src.game.bitboard import BitBoard
+from src.game.board import initialize_board
+from src.game.move_generator import apply_move, get_all_moves
+from src.game.pieces import RED_PIECE, BLACK_PIECE
+
+def test_position_encoding_round_trip():
+    """Test that positions survive the compact worker encoding"""
+    pos = BitBoard.from_board(initialize_board(), BLACK_PIECE)
+    decoded = decode_position(encode_position(pos))
+    assert decoded == pos
+    assert decoded.key == pos.key
+
+@pytest.mark.slow
+@pytest.mark.parametrize("player", [RED_PIECE, BLACK_PIECE])
+def test_parallel_matches_serial(player):
+    """Test that splitting the root across processes returns the serial result"""
+    board = initialize_board()
+    board = apply_move(board, ((5, 2), (4, 3)), RED_PIECE)
+    board = apply_move(board, ((2, 5), (3, 4)), BLACK_PIECE)
+    serial = minimax(board, 5, True, float('-inf'), float('inf'), player, SearchContext(quiescence=True))
+    parallel = minimax(board, 5, True, float('-inf'), float('inf'), player, SearchContext(quiescence=True),
+                       workers=2)
+    assert parallel == serial
+
+@pytest.mark.slow
+@pytest.mark.parametrize("label, player, rows",
+                         [p for p in BENCHMARK_POSITIONS if p[0] in ("early", "crowded", "black king", "late", "red king")])
+def test_parallel_engine_matches_serial(label, player, rows):
+    """Test that the engine splitting the root with its default options (PVS, LMR, caches) returns the serial result"""
+    board = parse_diagram(rows)
+    serial = create_engine("alphabeta").search(board, player, SearchLimits(depth=6))
+    parallel = create_engine("alphabeta", workers=2).search(board, player, SearchLimits(depth=6))
+    assert (parallel.move, parallel.score) == (serial.move, serial.score)
+
+@pytest.mark.slow
+def test_lazy_smp_returns_legal_move():
+    """Test that Lazy SMP over a shared table returns one of the root moves"""
+    board = initialize_board()
+    context = SearchContext(quiescence=True)
+    score, move = minimax(board, 5, True, float('-inf'), float('inf'), RED_PIECE, context,
+                          workers=3, parallel="lazy")
+    assert move in get_all_moves(board, RED_PIECE)
+    assert context.nodes > 0
+
+@pytest.mark.slow
+def test_lazy_smp_engine_ages_the_shared_table():
+    """Test that every Lazy SMP engine search marks the entries of earlier searches in the shared table stale"""
+    engine = create_engine("alphabeta", tt_mb=1, workers=2, parallel="lazy")
+    table = parallel.get_shared_table(1)
+    ages = []
+    for _ in range(2):
+        engine.search(initialize_board(), RED_PIECE, SearchLimits(depth=3))
+        ages.append(table.age)
+        assert table.usage() > 0
+    assert ages[1] == (ages[0] + 1) & 0xFF
+
+@pytest.mark.slow
+def test_stop_reaches_root_split_workers(monkeypatch):
+    """Test that stopping a depth-only search while the workers run ends it promptly"""
+    stop = threading.Event()
+    dispatched = []
+    get_pool = parallel.get_pool
+    def get_pool_and_stop(workers):
+        # The first move has been searched here; the rest are about to go to the workers
+        dispatched.append(time.perf_counter())
+        stop.set()
+        return get_pool(workers)
+    monkeypatch.setattr(parallel, "get_pool", get_pool_and_stop)
+    with pytest.raises(SearchTimeout):
+        minimax(initialize_board(), 10, True, float('-inf'), float('inf'), RED_PIECE,
+                SearchContext(quiescence=True, stop=stop), workers=2)
+    assert time.perf_counter() - dispatched[0] < 0.5
+    monkeypatch.undo()
+    score, move = minimax(initialize_board(), 4, True, float('-inf'), float('inf'), RED_PIECE,
+                          SearchContext(quiescence=True), workers=2)
+    assert move in get_all_moves(initialize_board(), RED_PIECE)
+
+def test_lazy_smp_is_selected(monkeypatch):
+    """Test that parallel="lazy" runs Lazy SMP rather than the root split"""
+    calls = []
+    monkeypatch.setattr(parallel, "lazy_smp_search", lambda *args: calls.append("lazy") or (0.0, None))
+    monkeypatch.setattr(parallel, "parallel_root_search", lambda *args: calls.append("root") or (0.0, None))
+    for mode in ("lazy", "root"):
+        minimax(initialize_board(), 3, True, float('-inf'), float('inf'), RED_PIECE, SearchContext(),
+                workers=2, parallel=mode)
+    assert calls == ["lazy", "root"]
+
+def test_workers_get_the_search_table_size(monkeypatch):
+    """Test that the root split sizes the workers' tables like the searching one"""
+    sizes = []
+    monkeypatch.setattr(parallel, "parallel_root_search", lambda *args: sizes.append(args[-1]) or (0.0, None))
+    minimax(initialize_board(), 3, True, float('-inf'), float('inf'), RED_PIECE,
+            SearchContext(TranspositionTable(1)), workers=2)
+    assert sizes == [1]
+
+def test_importing_the_search_leaves_the_game_alone(tmp_path):
+    """Test that a fresh interpreter, as a pool worker is, imports the search without the game window or its logs"""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    code = ("import sys, logging, src.ai.parallel, src.ai.tablebase, src.ai.book; "
+            "assert 'src.game.checkers_game' not in sys.modules; "
+            "assert logging.getLogger().level == logging.WARNING")
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env={**os.environ, "PYTHONPATH": root}, check=True)
+    assert not list(tmp_path.iterdir())
+
+@pytest.mark.slow
+def test_lazy_smp_exits_cleanly(tmp_path):
+    """Test that workers attached to the shared table leave its cleanup to the searching process"""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    code = ("from src.ai.minimax import minimax, SearchContext; from src.game.board import initialize_board; "
+            "from src.game.pieces import RED_PIECE; "
+            "minimax(initialize_board(), 4, True, float('-inf'), float('inf'), RED_PIECE, SearchContext(), "
+            "workers=3, parallel='lazy')")
+    run = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env={**os.environ, "PYTHONPATH": root},
+                         capture_output=True, text=True, check=True)
+    assert "Traceback" not in run.stderr and "leaked" not in run.stderr
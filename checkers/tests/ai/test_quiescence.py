@@ -0,0 +1,37 @@
+import pytest
+from src.ai.minimax import minimax, SearchContext
+from src.game.pieces import RED_PIECE, BLACK_PIECE, EMPTY
+
+@pytest.fixture
+def hanging_piece_board(empty_board):
+    """Red can step next to a black piece that would then capture it"""
+    empty_board[5][2] = RED_PIECE
+    empty_board[3][4] = BLACK_PIECE
+    return empty_board
+
+def test_quiescence_sees_the_recapture(hanging_piece_board):
+    """Test that a depth-1 search with quiescence avoids dropping a piece"""
+    context = SearchContext(quiescence=True)
+    score, move = minimax(hanging_piece_board, 1, True, float('-inf'), float('inf'), RED_PIECE, context)
+    assert move == ((5, 2), (4, 1))
+    assert score > -0.5
+    assert context.qnodes > 0
+
+def test_quiescence_lowers_the_losing_line(hanging_piece_board):
+    """Test that the losing step is scored a piece worse once captures are resolved"""
+    board = [row[:] for row in hanging_piece_board]
+    board[5][2] = EMPTY
+    board[4][3] = RED_PIECE
+    flat, _ = minimax(board, 0, False, float('-inf'), float('inf'), RED_PIECE)
+    resolved, _ = minimax(board, 0, False, float('-inf'), float('inf'), RED_PIECE,
+                          SearchContext(quiescence=True))
+    assert resolved <= flat - 1
+
+def test_quiet_position_is_unchanged(empty_board):
+    """Test that quiescence returns the static evaluation when nothing can be taken"""
+    empty_board[5][2] = RED_PIECE
+    empty_board[0][7] = BLACK_PIECE
+    plain, _ = minimax(empty_board, 0, True, float('-inf'), float('inf'), RED_PIECE)
+    quiet, _ = minimax(empty_board, 0, True, float('-inf'), float('inf'), RED_PIECE,
+                       SearchContext(quiescence=True))
+    assert quiet == plain
@@ -0,0 +1,109 @@
+import random
+import pytest
+from src.ai.engine import create_engine, SearchLimits
+from src.ai.minimax import minimax, SearchContext
+from src.ai.tablebase import Tablebase, build_tablebases, signatures, tablebase_score, TB_WIN
+from src.ai.tablebase import _placements, table_index, table_position, table_size
+from src.game.bitboard import BitBoard, get_all_moves
+from src.game.pieces import *
+
+@pytest.fixture(scope="module")
+def tablebase(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("tablebases")
+    build_tablebases(str(directory), max_pieces=2)
+    tablebase = Tablebase(str(directory))
+    yield tablebase
+    tablebase.close()
+
+def test_values_agree_with_successors(tablebase):
+    """Test that every stored value follows from the values one move later"""
+    for signature in signatures(2):
+        for red, black, kings in _placements(signature):
+            for player in (RED_PIECE, BLACK_PIECE):
+                position = BitBoard(red, black, kings, player=player)
+                value = tablebase.probe(position, player)
+                opponent = BLACK_PIECE if player == RED_PIECE else RED_PIECE
+                outcomes = []
+                for move in get_all_moves(position, player):
+                    undo = position.make_move(move)
+                    after = tablebase.probe(position, opponent)
+                    position.unmake_move(undo)
+                    outcomes.append(-1 if after is None else after)  # None: the last piece was taken
+                losses = [-v - 1 for v in outcomes if v < 0]
+                if losses:
+                    assert value == min(losses) + 1
+                elif 0 in outcomes:
+                    assert value == 0
+                else:
+                    assert value == -(max(outcomes, default=-1) + 2)
+
+def _mask(squares):
+    return sum(1 << sq for sq in squares)
+
+def test_index_round_trip():
+    """Test that every placement has its own index below the table size, and maps back to itself"""
+    for signature in ((2, 0, 1, 0), (1, 1, 0, 1), (0, 1, 2, 0)):
+        seen = set()
+        for red, black, kings in _placements(signature):
+            for player in (RED_PIECE, BLACK_PIECE):
+                index = table_index(signature, red, black, kings, player)
+                assert 0 <= index < table_size(signature) and index not in seen
+                seen.add(index)
+                assert table_position(signature, index) == (red, black, kings, player)
+    # Red men beyond four crowd the black men's squares
+    rng = random.Random(5)
+    for signature in ((6, 1, 5, 0), (8, 0, 2, 2), (0, 3, 0, 3)):
+        red_men, red_kings, black_men, black_kings = signature
+        for _ in range(200):
+            red_men_squares = rng.sample(range(4, 32), red_men)
+            black_men_squares = rng.sample([sq for sq in range(28) if sq not in red_men_squares], black_men)
+            free = [sq for sq in range(32) if sq not in red_men_squares + black_men_squares]
+            king_squares = rng.sample(free, red_kings + black_kings)
+            red_kings_mask = _mask(king_squares[:red_kings])
+            kings = _mask(king_squares)
+            red, black = _mask(red_men_squares) | red_kings_mask, _mask(black_men_squares) | kings ^ red_kings_mask
+            index = table_index(signature, red, black, kings, BLACK_PIECE)
+            assert index < table_size(signature)
+            assert table_position(signature, index) == (red, black, kings, BLACK_PIECE)
+
+def test_engine_plays_tablebase_win(tablebase):
+    """Test that the search takes the quickest win the tables show"""
+    board = [[EMPTY] * 8 for _ in range(8)]
+    board[1][2] = RED_PIECE
+    board[0][5] = BLACK_KING
+    engine = create_engine("alphabeta", tt_mb=1, tablebase_dir=tablebase.directory)
+    result = engine.search(board, RED_PIECE, SearchLimits(depth=3))
+    # Crowning on (0, 1) also wins, but four plies later
+    assert result.move == ((1, 2), (0, 3))
+    # Scored at the reply, which is six plies from the end
+    assert result.score == pytest.approx(TB_WIN - 6)
+    assert result.stats.tablebase_hits > 0
+
+@pytest.mark.slow
+def test_parallel_search_uses_tablebase(tablebase):
+    """Test that root moves searched by pool workers are scored from the tables as well"""
+    board = [[EMPTY] * 8 for _ in range(8)]
+    board[1][2] = RED_PIECE
+    board[0][5] = BLACK_KING
+    results = [minimax(board, 3, True, float('-inf'), float('inf'), RED_PIECE,
+                       SearchContext(tablebase=tablebase), workers=workers) for workers in (1, 2)]
+    assert results[1] == results[0]
+    assert results[0] == (pytest.approx(TB_WIN - 6), ((1, 2), (0, 3)))
+
+def test_engine_plays_tablebase_win_for_black(tablebase):
+    """Test that a black search uses the tables for black, taking its quickest win"""
+    board = [[EMPTY] * 8 for _ in range(8)]
+    board[5][2] = RED_PIECE
+    board[2][3] = BLACK_KING
+    position = BitBoard.from_board(board, BLACK_PIECE)
+    assert tablebase.probe(position, BLACK_PIECE) == 3
+    engine = create_engine("alphabeta", tt_mb=1, tablebase_dir=tablebase.directory)
+    result = engine.search(board, BLACK_PIECE, SearchLimits(depth=3))
+    assert result.move == ((2, 3), (3, 2))
+    assert result.score == pytest.approx(TB_WIN - 2)
+
+def test_tablebase_score_sign():
+    """Test that scores are for the side to move and prefer quicker wins"""
+    assert tablebase_score(1) > tablebase_score(3) > 0
+    assert tablebase_score(-1) < tablebase_score(-3) < 0
+    assert tablebase_score(0) == 0
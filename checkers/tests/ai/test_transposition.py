@@ -0,0 +1,66 @@
+from src.ai.minimax import minimax, SearchContext
+from src.ai.transposition import TranspositionTable, SharedTranspositionTable, EXACT, LOWER, UPPER, HEADER_WORDS, SLOT_WORDS
+from src.game.pieces import RED_PIECE, RED_KING, BLACK_KING, EMPTY
+
+def test_store_and_probe():
+    """Test that a stored entry comes back with its move"""
+    tt = TranspositionTable(size_mb=1)
+    tt.store(12345, 4, 1.5, LOWER, ((5, 0), (4, 1)))
+    assert tt.probe(12345) == (4, 1.5, LOWER, ((5, 0), (4, 1)))
+    assert tt.probe(54321) is None
+    assert tt.hits == 1 and tt.probes == 2
+
+def test_depth_preferred_and_always_replace():
+    """Test that a shallow entry does not evict a deeper one from the same bucket"""
+    tt = TranspositionTable(size_mb=1)
+    buckets = tt.slots // 2
+    deep, shallow, newer = 7, 7 + buckets, 7 + 2 * buckets
+    tt.store(deep, 6, 1.0, EXACT)
+    tt.store(shallow, 2, 2.0, EXACT)
+    tt.store(newer, 1, 3.0, UPPER)
+    assert tt.probe(deep)[0] == 6  # Depth-preferred slot kept
+    assert tt.probe(shallow) is None  # Always-replace slot overwritten
+    assert tt.probe(newer)[1] == 3.0
+
+def test_size_is_bounded():
+    """Test that the table never holds more entries than its size allows"""
+    assert TranspositionTable(size_mb=1).slots * 21 <= 1024 * 1024
+
+def test_search_with_table_matches_plain_search():
+    """Test that the transposition table does not change the minimax value"""
+    board = [[EMPTY for _ in range(8)] for _ in range(8)]
+    board[7][0] = RED_KING
+    board[5][2] = RED_KING
+    board[0][7] = BLACK_KING
+    board[2][5] = BLACK_KING
+    plain = SearchContext()
+    cached = SearchContext(TranspositionTable(size_mb=1))
+    plain_score, _ = minimax(board, 5, True, float('-inf'), float('inf'), RED_PIECE, plain)
+    cached_score, move = minimax(board, 5, True, float('-inf'), float('inf'), RED_PIECE, cached)
+    assert cached_score == plain_score
+    assert move is not None
+    assert cached.nodes < plain.nodes
+
+def test_shared_table_is_visible_to_attached_copies():
+    """Test that entries written to the shared table are read back through another handle"""
+    tt = SharedTranspositionTable(size_mb=1)
+    try:
+        other = SharedTranspositionTable.attach(tt.name)
+        tt.store(12345, 4, -1.5, UPPER, ((5, 0), (4, 1)))
+        assert other.probe(12345) == (4, -1.5, UPPER, ((5, 0), (4, 1)))
+        other.stop.set()
+        assert tt.stop.is_set()
+        other.close()
+    finally:
+        tt.close()
+
+def test_shared_table_rejects_torn_entries():
+    """Test that a slot whose words do not match its checksum is ignored"""
+    tt = SharedTranspositionTable(size_mb=1)
+    try:
+        tt.store(99, 3, 2.0, EXACT)
+        slot = (99 & tt._bucket_mask) * 2
+        tt._scores[HEADER_WORDS + slot * SLOT_WORDS + 1] = 7.0  # Score from another writer
+        assert tt.probe(99) is None
+    finally:
+        tt.close()
@@ -10,4 +10,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 def empty_board():
     """Returns an empty 8x8 board"""
     from src.game.pieces import EMPTY
-    return [[EMPTY for _ in range(8)] for _ in range(8)]
\ No newline at end of file
+    return [[EMPTY for _ in range(8)] for _ in range(8)]
+@pytest.fixture
+def same_ends_board(empty_board):
+    """A red king with two multi-jumps to (4, 1) and two loops back to (0, 5), each pair capturing different men"""
+    from src.game.pieces import RED_KING, BLACK_PIECE
+    empty_board[0][5] = RED_KING
+    for row, col in ((1, 4), (1, 6), (3, 4), (3, 6), (4, 7), (5, 4), (5, 2)):
+        empty_board[row][col] = BLACK_PIECE
+    return empty_board
@@ -0,0 +1,140 @@
+import random
+import pytest
+from src.game.bitboard import BitBoard, material_halves, move_count
+from src.game.move_generator import get_all_moves, get_capturing_moves_from, get_possible_moves, apply_move
+from src.game.pieces import RED_PIECE, BLACK_PIECE, RED_KING, BLACK_KING, EMPTY
+
+def test_round_trip(standard_board):
+    """Test that converting to a bitboard and back preserves the board"""
+    pos = BitBoard.from_board(standard_board)
+    assert pos.to_board() == standard_board
+    assert bin(pos.red).count("1") == 12
+    assert bin(pos.black).count("1") == 12
+    assert pos.kings == 0
+
+def test_moves_match_list_generator(standard_board):
+    """Test that the bitboard generator returns the same moves in the same order"""
+    pos = BitBoard.from_board(standard_board)
+    for player in (RED_PIECE, BLACK_PIECE):
+        for must_capture in (True, False):
+            assert get_all_moves(pos, player, must_capture) == get_all_moves(standard_board, player, must_capture)
+
+def test_moves_match_list_generator_in_detail():
+    """Test that random positions with kings and multi-jumps give the same paths, captures and crowning"""
+    rng = random.Random(7)
+    squares = [(row, col) for row in range(8) for col in range(8) if (row + col) % 2 == 1]
+    for _ in range(500):
+        board = [[EMPTY] * 8 for _ in range(8)]
+        for row, col in rng.sample(squares, rng.randint(2, 16)):
+            board[row][col] = rng.choice([RED_PIECE, RED_PIECE, BLACK_PIECE, BLACK_PIECE, RED_KING, BLACK_KING])
+        for player in (RED_PIECE, BLACK_PIECE):
+            pos = BitBoard.from_board(board, player)
+            for must_capture in (True, False):
+                expected = get_all_moves(board, player, must_capture)
+                moves = get_all_moves(pos, player, must_capture)
+                assert [(m.path, m.captured, m.promotion) for m in moves] == \
+                       [(m.path, m.captured, m.promotion) for m in expected]
+
+def test_capture_and_promotion(empty_board):
+    """Test that a capture onto the back row removes the piece and crowns the king"""
+    empty_board[2][3] = RED_PIECE
+    empty_board[1][2] = BLACK_PIECE
+    pos = BitBoard.from_board(empty_board)
+    assert get_all_moves(pos, RED_PIECE) == [((2, 3), (0, 1))]
+    assert get_capturing_moves_from(pos, 2, 3) == [((2, 3), (0, 1))]
+
+    new_pos = apply_move(pos, ((2, 3), (0, 1)), RED_PIECE)
+    board = new_pos.to_board()
+    assert board[0][1] == RED_KING
+    assert board[1][2] == EMPTY
+    assert new_pos.black == 0
+    assert pos.black != 0  # The original position is untouched
+
+def test_king_moves_both_ways(empty_board):
+    """Test that kings step in all four directions"""
+    empty_board[4][3] = BLACK_KING
+    pos = BitBoard.from_board(empty_board)
+    assert sorted(get_possible_moves(pos, 4, 3)) == sorted(get_possible_moves(empty_board, 4, 3))
+    assert len(get_possible_moves(pos, 4, 3)) == 4
+
+def test_light_square_board(empty_board):
+    """Test that boards using only light squares are mirrored onto the playable squares"""
+    empty_board[3][3] = RED_PIECE
+    empty_board[2][2] = BLACK_PIECE
+    pos = BitBoard.from_board(empty_board)
+    assert pos.to_board() == empty_board
+    assert get_all_moves(pos, RED_PIECE) == [((3, 3), (1, 1))]
+
+def test_mixed_square_colours_rejected(empty_board):
+    """Test that a board with pieces on both square colours cannot be packed"""
+    empty_board[0][0] = RED_PIECE
+    empty_board[0][1] = BLACK_PIECE
+    with pytest.raises(ValueError):
+        BitBoard.from_board(empty_board)
+
+def test_make_unmake_restores_capture_and_promotion(empty_board):
+    """Test that unmake_move restores a captured king and undoes a promotion"""
+    empty_board[2][3] = RED_PIECE
+    empty_board[1][2] = BLACK_KING
+    pos = BitBoard.from_board(empty_board)
+    before = pos.copy()
+
+    undo = pos.make_move(((2, 3), (0, 1)))
+    assert pos == apply_move(before, ((2, 3), (0, 1)), RED_PIECE)
+    assert pos.to_board()[0][1] == RED_KING
+
+    pos.unmake_move(undo)
+    assert pos == before
+    assert pos.to_board() == empty_board
+
+def test_make_unmake_whole_game(standard_board):
+    """Test that a sequence of moves unwinds back to the start position"""
+    pos = BitBoard.from_board(standard_board)
+    player = RED_PIECE
+    undos = []
+    for _ in range(20):
+        moves = get_all_moves(pos, player)
+        if not moves:
+            break
+        undos.append(pos.make_move(moves[-1]))
+        player = BLACK_PIECE if player == RED_PIECE else RED_PIECE
+    for undo in reversed(undos):
+        pos.unmake_move(undo)
+    assert pos.to_board() == standard_board
+
+def test_incremental_material_and_move_count(empty_board):
+    """Test that make/unmake keep material current and move_count matches the generator"""
+    empty_board[2][3] = RED_PIECE
+    empty_board[1][2] = BLACK_KING
+    empty_board[5][4] = BLACK_PIECE
+    pos = BitBoard.from_board(empty_board)
+    assert pos.material == -3  # Half points: man 2 - (king 3 + man 2)
+    for player in (RED_PIECE, BLACK_PIECE):
+        assert move_count(pos, player) == len(get_all_moves(pos, player))
+    undo = pos.make_move(((2, 3), (0, 1)))  # Takes the king and is crowned
+    assert pos.material == material_halves(pos.red, pos.black, pos.kings) == 1
+    pos.unmake_move(undo)
+    assert pos.material == -3
+
+def test_multi_jump_is_one_move(empty_board):
+    """Test that a double jump comes back as one Move with its path, captures and crowning"""
+    empty_board[6][1] = RED_PIECE
+    empty_board[5][2] = BLACK_PIECE
+    empty_board[3][4] = BLACK_KING
+    empty_board[1][4] = BLACK_PIECE
+    pos = BitBoard.from_board(empty_board)
+    moves = get_all_moves(pos, RED_PIECE)
+    assert moves == get_all_moves(empty_board, RED_PIECE) == [((6, 1), (0, 3))]
+    move = moves[0]
+    assert move.path == ((6, 1), (4, 3), (2, 5), (0, 3))
+    assert move.captured == (1 << pos.square_at(5, 2)) | (1 << pos.square_at(3, 4)) | (1 << pos.square_at(1, 4))
+    assert move.promotion
+
+    before = pos.copy()
+    undo = pos.make_move(move)
+    assert pos.to_board() == apply_move(empty_board, move, RED_PIECE)
+    assert pos.black == 0 and pos.to_board()[0][3] == RED_KING
+    assert pos.material == material_halves(pos.red, pos.black, pos.kings)
+    assert pos.key == BitBoard.from_board(pos.to_board(), BLACK_PIECE).key
+    pos.unmake_move(undo)
+    assert pos == before and pos.key == before.key
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.game import checkers_game
+from src.game.checkers_game import CheckersGame, history_text
+from src.game.board import initialize_board, apply_move
+from src.game.move import encode_move
+from src.utils.file_handler import save_game, load_game
+from src.game.pieces import RED_PIECE, BLACK_PIECE
+
+@pytest.fixture
+def game(monkeypatch):
+    """A game whose AI thinks for a fraction of a second"""
+    monkeypatch.setattr(checkers_game, "AI_MOVE_TIME", 0.1)
+    game = CheckersGame()
+    yield game
+    game.cleanup()
+
+def wait_for_ai(game, timeout=10):
+    deadline = time.time() + timeout
+    while game.ai_thinking() and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_ai_moves_in_background(game):
+    """Test that the AI search runs off the main thread and its move is applied when polled"""
+    game.current_player = BLACK_PIECE
+    game.ai_move()
+    assert game.ai_future is not None
+    game.draw()  # The window can still be drawn while the AI thinks
+    wait_for_ai(game)
+    game.poll_ai_move()
+    assert game.ai_future is None
+    assert game.board != initialize_board()
+    assert game.current_player == RED_PIECE
+
+def test_new_game_drops_pending_search(game):
+    """Test that a search started before a new game does not move in the new one"""
+    game.current_player = BLACK_PIECE
+    game.ai_move()
+    future = game.ai_future
+    game.new_game()
+    future.result(timeout=10)
+    game.poll_ai_move()
+    assert game.board == initialize_board()
+    assert game.current_player == RED_PIECE
+
+def test_saved_game_replays(game, tmp_path, monkeypatch):
+    """Test that a finished turn is saved as packed moves and replays on load"""
+    move = ((5, 2), (4, 3))
+    game.board = apply_move(game.board, move, RED_PIECE)
+    game.finish_half_turn(RED_PIECE, encode_move(move))
+    game.current_player = BLACK_PIECE
+    game.ai_move()
+    wait_for_ai(game)
+    game.poll_ai_move()
+    assert history_text(game.move_history[0]) == "Turn 1 R: (5,2)->(4,3)"
+    played = [row[:] for row in game.board]
+    path = str(tmp_path / "game.txt")
+    assert save_game(path, game.move_history)
+    with open(path) as f:
+        assert f.readline() == f"1 r {encode_move(move):x}\n"
+    monkeypatch.setattr(checkers_game, "open_file_dialog", lambda: path)
+    game.load_game()
+    assert game.board == played
+    assert game.move_history == load_game(path)
+
+def test_importing_the_game_writes_no_log(tmp_path):
+    """Test that only starting the application, not importing the game module, creates a log file"""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = {**os.environ, "PYTHONPATH": root, "SDL_VIDEODRIVER": "dummy"}
+    subprocess.run([sys.executable, "-c", "import src.game.checkers_game"], cwd=tmp_path, env=env, check=True)
+    assert not list(tmp_path.iterdir())
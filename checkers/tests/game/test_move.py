@@ -0,0 +1,72 @@
+import random
+from src.game.move_generator import get_all_moves, apply_move
+from src.game.board import initialize_board
+from src.game.zobrist import board_key
+from src.game.move import Move, encode_move, decode_move, move_ends, move_text, MOVE_MASK, NO_MOVE
+from src.game.pieces import *
+from src.match.game_instance import GameInstance
+
+def test_packed_moves_round_trip():
+    """Test that every move of random games, on both square colours, decodes to itself"""
+    rng = random.Random(3)
+    mirrored = [row[::-1] for row in initialize_board()]
+    for start in (initialize_board(), mirrored):
+        for _ in range(20):
+            board, player = start, RED_PIECE
+            for _ in range(80):
+                moves = get_all_moves(board, player)
+                if not moves:
+                    break
+                for move in moves:
+                    code = encode_move(move)
+                    decoded = decode_move(code)
+                    assert decoded == move and decoded.path == move.path
+                    assert decoded.captured == move.captured and decoded.promotion == move.promotion
+                    assert move_ends(code) == tuple(move)
+                    if len(move.path) == 2:
+                        assert code <= MOVE_MASK and code != NO_MOVE
+                board = apply_move(board, rng.choice(moves), player)
+                player = BLACK_PIECE if player == RED_PIECE else RED_PIECE
+
+def test_multi_jump_keeps_its_path(empty_board):
+    """Test that a multi-jump packs its landing squares above the 16-bit move"""
+    empty_board[6][1] = RED_PIECE
+    empty_board[5][2] = BLACK_PIECE
+    empty_board[3][4] = BLACK_KING
+    empty_board[1][4] = BLACK_PIECE
+    move = get_all_moves(empty_board, RED_PIECE)[0]
+    code = encode_move(move)
+    assert code > MOVE_MASK
+    assert move_ends(code & MOVE_MASK) == ((6, 1), (0, 3))
+    assert move_text(code) == "(6,1)->(4,3)->(2,5)->(0,3)"
+    assert encode_move(((5, 2), (4, 3))) == encode_move(Move([(5, 2), (4, 3)]))
+
+
+def _game_on(board):
+    game = GameInstance("moves")
+    game.start_game()
+    game.board = [row[:] for row in board]
+    game.position_key = board_key(game.board, game.current_turn)
+    return game
+
+def test_game_plays_the_path_of_a_move(same_ends_board):
+    """Test that a game given a Move or its code plays that path, even when another shares its ends"""
+    for move in get_all_moves(same_ends_board, RED_PIECE):
+        expected = apply_move(same_ends_board, move, RED_PIECE)
+        for given in (move, encode_move(move)):
+            game = _game_on(same_ends_board)
+            assert game.make_move(given)
+            assert game.board == expected
+            assert game.current_turn == BLACK_PIECE
+            assert [move_text(code) for code in game.move_history] == [move_text(encode_move(hop)) for hop in move.hops()]
+
+def test_game_refuses_ambiguous_or_illegal_paths(same_ends_board):
+    """Test that shared ends alone and paths the generator never produced are refused without moving"""
+    attempts = (lambda game: game.make_move((0, 5), (4, 1)),
+                lambda game: game.make_move(encode_move(((0, 5), (4, 1)))),
+                lambda game: game.make_move(Move([(0, 5), (2, 3), (4, 1)])),
+                lambda game: game.make_move(((0, 5), (4, 1))))
+    for attempt in attempts:
+        game = _game_on(same_ends_board)
+        assert not attempt(game)
+        assert game.board == same_ends_board and game.move_history == []
@@ -0,0 +1,18 @@
+import pytest
+from src.game.bitboard import BitBoard
+from src.game.board import initialize_board
+from src.game.perft import perft, divide, REFERENCE_COUNTS
+from src.game.pieces import RED_PIECE
+
+@pytest.mark.parametrize("depth", [1, 2, 3, 4, 5])
+def test_perft_matches_reference(depth):
+    """Test that both generators count the known move sequences from the start"""
+    board = initialize_board()
+    assert perft(board, RED_PIECE, depth) == REFERENCE_COUNTS[depth]
+    assert perft(BitBoard.from_board(board, RED_PIECE), RED_PIECE, depth) == REFERENCE_COUNTS[depth]
+
+def test_divide_sums_to_perft():
+    """Test that the per-move breakdown covers every root move"""
+    counts = divide(initialize_board(), RED_PIECE, 3)
+    assert len(counts) == REFERENCE_COUNTS[1]
+    assert sum(nodes for _, nodes in counts) == REFERENCE_COUNTS[3]
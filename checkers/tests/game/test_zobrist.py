@@ -0,0 +1,40 @@
+from src.game.bitboard import BitBoard
+from src.game.zobrist import board_key
+from src.game.pieces import RED_PIECE, BLACK_PIECE, BLACK_KING
+from src.match.game_instance import GameInstance
+
+def test_key_includes_side_to_move(standard_board):
+    """Test that the same board with a different side to move hashes differently"""
+    assert board_key(standard_board, RED_PIECE) != board_key(standard_board, BLACK_PIECE)
+    assert BitBoard.from_board(standard_board).key == board_key(standard_board, RED_PIECE)
+
+def test_transposed_positions_share_a_key(standard_board):
+    """Test that two move orders reaching the same position produce the same key"""
+    first = BitBoard.from_board(standard_board)
+    for move in (((5, 0), (4, 1)), ((2, 1), (3, 0)), ((5, 2), (4, 3)), ((2, 3), (3, 2))):
+        first.make_move(move)
+    second = BitBoard.from_board(standard_board)
+    for move in (((5, 2), (4, 3)), ((2, 3), (3, 2)), ((5, 0), (4, 1)), ((2, 1), (3, 0))):
+        second.make_move(move)
+    assert first == second
+    assert first.key == second.key == board_key(first.to_board(), RED_PIECE)
+
+def test_unmake_restores_key(empty_board):
+    """Test that the key follows a capture with promotion and its unmake"""
+    empty_board[2][3] = RED_PIECE
+    empty_board[1][2] = BLACK_KING
+    pos = BitBoard.from_board(empty_board)
+    key = pos.key
+    undo = pos.make_move(((2, 3), (0, 1)))
+    assert pos.key == board_key(pos.to_board(), BLACK_PIECE)
+    pos.unmake_move(undo)
+    assert pos.key == key
+
+def test_game_instance_tracks_key():
+    """Test that GameInstance keeps its key in step with the board"""
+    game = GameInstance("zobrist")
+    game.start_game()
+    assert game.make_move((5, 0), (4, 1))
+    assert game.make_move((2, 1), (3, 2))
+    assert game.position_key == board_key(game.board, game.current_turn)
+    assert game.get_state()["position_key"] == game.position_key